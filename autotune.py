@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+TensorFlow İş Parçacığı Autotune Scripti
+Bu makinede worker sayısı, intra-op / inter-op iş parçacığı ve batch boyutu
+kombinasyonlarını ölçer; hedef p99 gecikmesini sağlayanlar arasından en
+yüksek throughput'a sahip ayarı önerir.
+
+Kullanım:
+    python autotune.py --target-p99-ms 50
+    python autotune.py --workers 1,2,4 --intra 1,2,4 --inter 1,2 --batch-sizes 1,16,64
+"""
+
+import argparse
+import csv
+import itertools
+import multiprocessing as mp
+import os
+import queue
+import time
+
+SAMPLE_MESSAGES = [
+    "You have won a free iPhone 13 Pro Max! Click the link to claim your prize.",
+    "I'm sorry to hear that you're having trouble with your account. Let me know if I can help you with anything.",
+    "URGENT: Your account has been suspended. Call now to reactivate!",
+    "Hi, how are you doing today? Would you like to grab coffee later?"
+]
+
+def parse_list(value):
+    return [int(v) for v in value.split(",") if v.strip()]
+
+def read_messages(path, text_column, encoding, limit=5000):
+    """Ölçümde kullanılacak gerçek mesajları CSV'den oku"""
+    messages = []
+    with open(path, newline='', encoding=encoding) as f:
+        for row in csv.DictReader(f):
+            messages.append(row[text_column])
+            if len(messages) >= limit:
+                break
+    return messages
+
+def benchmark_worker(intra, inter, batch_size, messages, duration, barrier, results, load_timeout):
+    """Tek bir worker süreci: iş parçacığı ayarını uygula, modeli yükle, batch'leri ölç"""
+    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'
+    import numpy as np
+    from main import MODEL_PATH, TOKENIZER_PATH, clean_text, configure_tf_threading, load_model_files, pad_sequences
+
+    configure_tf_threading(intra, inter)
+    model, tokenizer = load_model_files(MODEL_PATH, TOKENIZER_PATH)
+    seqs = tokenizer.texts_to_sequences([clean_text(m) for m in messages])
+    pad = pad_sequences(seqs, maxlen=100, padding='post')
+    reps = -(-batch_size // len(pad))
+    pad = np.tile(pad, (reps, 1)) if reps > 1 else pad
+
+    # Isınma
+    model.predict(pad[:batch_size], verbose=0)
+
+    # Diğer worker'lardan biri yüklenemezse sonsuza kadar beklenmez (BrokenBarrierError)
+    barrier.wait(timeout=load_timeout)
+    latencies = []
+    processed = 0
+    offset = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        batch = pad[offset:offset + batch_size]
+        if len(batch) < batch_size:
+            offset = 0
+            batch = pad[:batch_size]
+        t0 = time.perf_counter()
+        model.predict(batch, verbose=0)
+        latencies.append(time.perf_counter() - t0)
+        processed += len(batch)
+        offset += batch_size
+    results.put((processed, time.perf_counter() - start, latencies))
+
+def run_combination(workers, intra, inter, batch_size, messages, duration, load_timeout):
+    """Bir kombinasyonu worker sayısı kadar süreçle aynı anda çalıştır; başarısızsa None"""
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=benchmark_worker,
+                    args=(intra, inter, batch_size, messages, duration, barrier, results, load_timeout))
+        for _ in range(workers)
+    ]
+    for p in procs:
+        p.start()
+
+    # Yükleme + ölçüm süresi + pay; çöken worker beklenmeden fark edilir
+    deadline = time.monotonic() + load_timeout + duration + 30
+    collected = []
+    error = None
+    while len(collected) < workers:
+        try:
+            collected.append(results.get(timeout=1.0))
+            continue
+        except queue.Empty:
+            pass
+        failed = [p.exitcode for p in procs if p.exitcode not in (None, 0)]
+        if failed:
+            error = f"worker çıkış kodu {failed[0]}"
+            break
+        if time.monotonic() > deadline:
+            error = "zaman aşımı"
+            break
+    for p in procs:
+        if error is not None and p.is_alive():
+            p.terminate()
+        p.join()
+    if error is not None:
+        print(f"❌ workers={workers} intra={intra} inter={inter} batch={batch_size} ölçülemedi: {error}")
+        return None
+
+    import numpy as np
+    latencies = np.concatenate([np.asarray(lat) for _, _, lat in collected])
+    wall = max(elapsed for _, elapsed, _ in collected)
+    return {
+        "workers": workers,
+        "intra": intra,
+        "inter": inter,
+        "batch_size": batch_size,
+        "throughput": sum(count for count, _, _ in collected) / wall,
+        "p50_ms": float(np.percentile(latencies, 50) * 1000),
+        "p99_ms": float(np.percentile(latencies, 99) * 1000)
+    }
+
+def main():
+    cores = os.cpu_count() or 1
+    default_workers = sorted({1, max(1, cores // 2), cores})
+    parser = argparse.ArgumentParser(description="TensorFlow iş parçacığı ve worker ayarlarını ölç")
+    parser.add_argument("--workers", type=parse_list, default=default_workers)
+    parser.add_argument("--intra", type=parse_list, default=None,
+                        help="intra_op iş parçacıkları (varsayılan: 1, 2 ve çekirdek/worker)")
+    parser.add_argument("--inter", type=parse_list, default=[1, 2])
+    parser.add_argument("--batch-sizes", type=parse_list, default=[1, 16, 64])
+    parser.add_argument("--duration", type=float, default=5.0, help="Kombinasyon başına ölçüm süresi (saniye)")
+    parser.add_argument("--target-p99-ms", type=float, default=50.0)
+    parser.add_argument("--load-timeout", type=float, default=300.0,
+                        help="Worker başına model yükleme ve ısınma için süre sınırı (saniye)")
+    parser.add_argument("--data", help="Gerçek mesaj dağılımı için CSV dosyası")
+    parser.add_argument("--text-column", default="v2")
+    parser.add_argument("--encoding", default="latin-1")
+    args = parser.parse_args()
+
+    messages = read_messages(args.data, args.text_column, args.encoding) if args.data else SAMPLE_MESSAGES
+
+    combinations = []
+    for workers in args.workers:
+        intra_options = args.intra or sorted({1, 2, max(1, cores // workers)})
+        # Toplam iş parçacığı çekirdek sayısının iki katını aşan kombinasyonlar ölçülmez
+        for intra, inter, batch_size in itertools.product(intra_options, args.inter, args.batch_sizes):
+            if workers * intra <= cores * 2:
+                combinations.append((workers, intra, inter, batch_size))
+
+    print(f"🚀 {cores} çekirdek, {len(combinations)} kombinasyon ölçülecek (~{len(combinations) * args.duration:.0f} sn)\n")
+    print(f"{'worker':>6} {'intra':>5} {'inter':>5} {'batch':>5} {'msg/sn':>10} {'p50 ms':>8} {'p99 ms':>8}")
+
+    results = []
+    for workers, intra, inter, batch_size in combinations:
+        row = run_combination(workers, intra, inter, batch_size, messages, args.duration, args.load_timeout)
+        if row is None:
+            continue
+        results.append(row)
+        print(f"{workers:>6} {intra:>5} {inter:>5} {batch_size:>5} {row['throughput']:>10.1f} "
+              f"{row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f}")
+
+    eligible = [r for r in results if r["p99_ms"] <= args.target_p99_ms]
+    if not eligible:
+        print(f"\n❌ Hiçbir kombinasyon {args.target_p99_ms} ms p99 hedefini sağlamadı")
+        return
+    best = max(eligible, key=lambda r: r["throughput"])
+    print(f"\n✅ Önerilen ayar ({args.target_p99_ms} ms p99 hedefi): "
+          f"{best['throughput']:.1f} msg/sn, p99 {best['p99_ms']:.1f} ms")
+    print(f"WEB_CONCURRENCY={best['workers']} TF_INTRA_OP_THREADS={best['intra']} "
+          f"TF_INTER_OP_THREADS={best['inter']} BATCH_MAX_SIZE={best['batch_size']}")
+
+if __name__ == "__main__":
+    main()
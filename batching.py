@@ -0,0 +1,117 @@
+"""
+Dinamik mikro-toplama (micro-batching).
+
+Farklı isteklerden gelen tekil mesajlar kısa bir süre biriktirilip tek bir
+model çağrısında skorlanır. Model çağrıları tek bir çıkarım iş parçacığında
+yapılır; olay döngüsü bu sırada yeni istekleri kabul etmeye devam eder.
+Büyük toplu istekler en fazla max_job_size mesajlık işlere bölünür ve sırayla
+gönderilir; aradaki tekil istekler büyük bir batch'in tamamını beklemez.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MicroBatcher:
+    """Mesajları biriktirip predict_fn(messages, state) ile toplu skorlar"""
+
+    def __init__(self, predict_fn, max_batch_size: int = 64, max_wait_ms: float = 2.0, max_job_size: int = 1024):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_job_size = max_job_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self.queue = None
+        self.task = None
+        self.stats = {"batches": 0, "messages": 0, "max_batch": 0, "split_jobs": 0}
+
+    def start(self):
+        if self.task is None:
+            self.queue = asyncio.Queue()
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+        self.executor.shutdown(wait=True)
+
+    async def submit(self, message: str, state) -> dict:
+        """Tek mesajı sıraya koy, toplu skorlandığında sonucunu döndür"""
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, state, future))
+        return await future
+
+    async def submit_many(self, messages: list, state) -> list:
+        """Zaten toplu gelen mesajları aynı çıkarım iş parçacığında skorla
+
+        İşler tek tek kuyruğa girer; bir iş bitmeden sıradaki gönderilmez, bu
+        arada biriken tekil batch'ler araya girer.
+        """
+        if len(messages) <= self.max_job_size:
+            return await self._execute(messages, state)
+        results = []
+        for i in range(0, len(messages), self.max_job_size):
+            self.stats["split_jobs"] += 1
+            results.extend(await self._execute(messages[i:i + self.max_job_size], state))
+        return results
+
+    async def _execute(self, messages: list, state) -> list:
+        self.stats["batches"] += 1
+        self.stats["messages"] += len(messages)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(messages))
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.predict_fn, messages, state)
+
+    async def _collect(self) -> list:
+        """İlk mesajı bekle, ardından max_wait süresince veya batch dolana kadar topla"""
+        batch = [await self.queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Yeniden yükleme sırasında farklı model sürümleri ayrı skorlanır
+            groups = {}
+            for message, state, future in batch:
+                groups.setdefault(id(state), (state, []))[1].append((message, future))
+            for state, items in groups.values():
+                try:
+                    results = await self._execute([m for m, _ in items], state)
+                except Exception as e:
+                    for _, future in items:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+
+    def report(self) -> dict:
+        stats = dict(self.stats)
+        stats["avg_batch"] = stats["messages"] / stats["batches"] if stats["batches"] else 0.0
+        stats["queued"] = self.queue.qsize() if self.queue is not None else 0
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        stats["max_job_size"] = self.max_job_size
+        return stats
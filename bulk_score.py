@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Toplu SMS Skorlama Scripti
+Arşivlenmiş mesajları HTTP, JWT ve JSON katmanlarına girmeden predict_sms ile
+aynı clean_text + tokenizer + model hattıyla skorlar. Girdi parça parça okunur,
+ön işleme süreç havuzunda paralel yapılır, çıkarım büyük batch'lerle çalışır
+ve sonuçlar her parçadan sonra diske yazılır.
+
+Kullanım:
+    python bulk_score.py archive.csv scores.ndjson --text-column message --id-column id
+    python bulk_score.py archive.ndjson scores.csv --resume
+"""
+
+import argparse
+import csv
+import json
+import os
+import pickle
+import sys
+import time
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+import numpy as np
+
+from main import (INFERENCE_ENGINE, NUMPY_MODEL_PATH, TOKENIZER_PATH, clean_text,
+                  load_versioned_artifacts)
+from numpy_engine import pad_sequences
+from preload import CompactTokenizer
+
+# Süreç havuzundaki her worker'ın tokenizer'ı
+worker_tokenizer = None
+
+def init_worker():
+    """Worker başına tokenizer'ı bir kez yükle"""
+    global worker_tokenizer
+    if INFERENCE_ENGINE == "numpy":
+        worker_tokenizer = CompactTokenizer.from_arrays(np.load(NUMPY_MODEL_PATH))
+    else:
+        with open(TOKENIZER_PATH, 'rb') as f:
+            worker_tokenizer = CompactTokenizer.from_keras(pickle.load(f))
+
+def preprocess(messages):
+    """Mesajları temizle, tokenize et ve doldur"""
+    seqs = worker_tokenizer.texts_to_sequences([clean_text(m) for m in messages])
+    return pad_sequences(seqs, maxlen=100, padding='post')
+
+def read_records(path, text_column, id_column, encoding):
+    """CSV veya NDJSON girdiyi (id, mesaj) çiftleri olarak akış halinde oku"""
+    with open(path, newline='', encoding=encoding) as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield (row.get(id_column) if id_column else None), row[text_column] or ""
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                yield (row.get(id_column) if id_column else None), row.get(text_column) or ""
+
+def resume_offset(path):
+    """Çıktıdaki son tamamlanmış kaydın offset'inden bir sonrası; yarım kalmış son satırı kes
+
+    Kayıt sayısı yerine offset alanı kullanılır, --start-offset ile başlamış
+    işler de doğru yerden devam eder. Çıktıda kayıt yoksa None.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb+') as f:
+        size = f.seek(0, os.SEEK_END)
+        # Dosyanın tamamı yerine sondan geriye doğru iki satır sonu bulunana kadar oku
+        tail = b''
+        position = size
+        while position > 0 and tail.count(b'\n') < 2:
+            step = min(64 * 1024, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+        end = tail.rfind(b'\n') + 1
+        if position + end < size:
+            f.truncate(position + end)
+    lines = tail[:end].splitlines()
+    if not lines:
+        return None
+    last = lines[-1].decode('utf-8')
+    if path.endswith(".csv"):
+        value = next(csv.reader([last]))[0]
+        if value == "offset":
+            # Yalnızca başlık satırı var
+            return None
+        return int(value) + 1
+    return json.loads(last)["offset"] + 1
+
+class ResultWriter:
+    """Sonuçları CSV veya NDJSON olarak parça parça yaz"""
+
+    def __init__(self, path, append):
+        self.csv = path.endswith(".csv")
+        write_header = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        self.file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self.fields = ["offset", "id", "prediction", "is_spam", "model_version"]
+        if self.csv:
+            self.writer = csv.writer(self.file)
+            if write_header:
+                self.writer.writerow(self.fields)
+
+    def write(self, rows):
+        for row in rows:
+            if self.csv:
+                self.writer.writerow([row[k] for k in self.fields])
+            else:
+                self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def chunked(records, size):
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+def main():
+    parser = argparse.ArgumentParser(description="Arşivlenmiş SMS mesajlarını toplu skorla")
+    parser.add_argument("input", help="CSV veya NDJSON girdi dosyası")
+    parser.add_argument("output", help="CSV veya NDJSON çıktı dosyası")
+    parser.add_argument("--text-column", default="message")
+    parser.add_argument("--id-column", default=None)
+    parser.add_argument("--encoding", default="utf-8")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Tek seferde okunan mesaj sayısı")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Model çağrısı başına mesaj sayısı")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Ön işleme süreç sayısı")
+    parser.add_argument("--start-offset", type=int, default=0, help="Bu kayda kadar olanları atla")
+    parser.add_argument("--resume", action="store_true", help="Çıktıdaki son kaydın offset'inden devam et")
+    args = parser.parse_args()
+
+    resumed = resume_offset(args.output) if args.resume else None
+    offset = resumed if resumed is not None else args.start_offset
+    print(f"🚀 Skorlama başlıyor: {args.input} -> {args.output} (başlangıç kaydı: {offset})")
+
+    # Havuz, model yüklenmeden önce fork edilir; worker'lar TensorFlow durumunu devralmaz
+    with Pool(args.workers, initializer=init_worker) as pool:
+        model, _, version = load_versioned_artifacts()
+        records = islice(read_records(args.input, args.text_column, args.id_column, args.encoding), offset, None)
+        writer = ResultWriter(args.output, append=args.resume or offset > 0)
+
+        # Ön işleme havuzda en fazla 2 * worker parça önden gider, bellek sınırlı kalır
+        max_pending = 2 * args.workers
+        pending = deque()
+        chunks = chunked(records, args.chunk_size)
+        processed = 0
+        start = time.perf_counter()
+
+        while True:
+            while len(pending) < max_pending:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                ids = [record_id for record_id, _ in chunk]
+                pending.append((ids, pool.apply_async(preprocess, ([m for _, m in chunk],))))
+            if not pending:
+                break
+
+            ids, result = pending.popleft()
+            pad = result.get()
+            scores = model.predict(pad, batch_size=args.batch_size, verbose=0)[:, 0]
+            writer.write(
+                {
+                    "offset": offset + i,
+                    "id": record_id,
+                    "prediction": round(float(score), 6),
+                    "is_spam": bool(score > 0.5),
+                    "model_version": version
+                }
+                for i, (record_id, score) in enumerate(zip(ids, scores))
+            )
+            offset += len(ids)
+            processed += len(ids)
+            elapsed = time.perf_counter() - start
+            print(f"\r⏳ {offset} kayıt, {processed / elapsed:.0f} mesaj/sn", end="", file=sys.stderr)
+
+    writer.close()
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ {processed} mesaj {elapsed:.1f} sn'de skorlandı ({processed / max(elapsed, 1e-9):.0f} mesaj/sn)")
+    print(f"Devam etmek için: --start-offset {offset} veya --resume")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Ön eleme (cascade) sınıflandırıcısı.
+
+Hash'lenmiş kelime n-gram özellikleri üzerinde NumPy ile çalışan lojistik
+regresyon. Açıkça spam veya açıkça ham olan mesajlar burada karara bağlanır,
+yalnızca belirsizlik bandındaki mesajlar sinir ağı modeline gönderilir.
+"""
+
+import hashlib
+import json
+import zlib
+
+import numpy as np
+
+
+class HashedNgramClassifier:
+    """Hash'lenmiş n-gram + lojistik regresyon ön sınıflandırıcısı"""
+
+    def __init__(self, weights: np.ndarray, bias: float, ngram_max: int = 2,
+                 low: float = 0.05, high: float = 0.95, metadata: dict = None):
+        self.weights = weights.astype(np.float32)
+        self.bias = float(bias)
+        self.n_buckets = len(weights)
+        self.ngram_max = ngram_max
+        self.low = low
+        self.high = high
+        self.metadata = metadata or {}
+        self.version = hashlib.sha256(self.weights.tobytes()).hexdigest()[:12]
+
+    def features(self, text: str) -> np.ndarray:
+        """Temizlenmiş metnin n-gram'larını bucket indekslerine çevir (ikili özellik)"""
+        tokens = text.split()
+        buckets = set()
+        for n in range(1, self.ngram_max + 1):
+            for i in range(len(tokens) - n + 1):
+                gram = ' '.join(tokens[i:i + n])
+                buckets.add(zlib.crc32(gram.encode('utf-8')) % self.n_buckets)
+        return np.fromiter(buckets, dtype=np.int64, count=len(buckets))
+
+    def score(self, text: str) -> float:
+        """Spam olasılığını döndür"""
+        logit = self.bias + float(self.weights[self.features(text)].sum())
+        return float(1.0 / (1.0 + np.exp(-logit)))
+
+    def score_many(self, texts: list) -> np.ndarray:
+        return np.array([self.score(t) for t in texts], dtype=np.float32)
+
+    def is_confident(self, score: float) -> bool:
+        """Skor belirsizlik bandının dışındaysa model çağrısına gerek yok"""
+        return score <= self.low or score >= self.high
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path,
+            weights=self.weights,
+            bias=np.float32(self.bias),
+            ngram_max=np.int32(self.ngram_max),
+            band=np.array([self.low, self.high], dtype=np.float64),
+            metadata=np.array(json.dumps(self.metadata))
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        low, high = (float(v) for v in data['band'])
+        return cls(
+            data['weights'],
+            float(data['bias']),
+            ngram_max=int(data['ngram_max']),
+            low=low,
+            high=high,
+            metadata=json.loads(str(data['metadata']))
+        )
+
+    @classmethod
+    def train(cls, texts: list, labels, n_buckets: int = 2 ** 18, ngram_max: int = 2,
+              epochs: int = 300, learning_rate: float = 0.5, l2: float = 1e-5):
+        """Tam yığın AdaGrad ile lojistik regresyon eğit"""
+        clf = cls(np.zeros(n_buckets, dtype=np.float32), 0.0, ngram_max=ngram_max)
+        rows = [clf.features(t) for t in texts]
+        lengths = np.array([len(r) for r in rows], dtype=np.int64)
+        indices = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        doc_ids = np.repeat(np.arange(len(rows)), lengths)
+        y = np.asarray(labels, dtype=np.float64)
+
+        w = np.zeros(n_buckets, dtype=np.float64)
+        b = 0.0
+        g2_w = np.full(n_buckets, 1e-8)
+        g2_b = 1e-8
+        for _ in range(epochs):
+            logits = b + np.bincount(doc_ids, weights=w[indices], minlength=len(rows))
+            err = 1.0 / (1.0 + np.exp(-logits)) - y
+            grad_w = np.bincount(indices, weights=err[doc_ids], minlength=n_buckets) / len(rows) + l2 * w
+            grad_b = err.mean()
+            g2_w += grad_w ** 2
+            g2_b += grad_b ** 2
+            w -= learning_rate * grad_w / np.sqrt(g2_w)
+            b -= learning_rate * grad_b / np.sqrt(g2_b)
+
+        return cls(w, b, ngram_max=ngram_max)
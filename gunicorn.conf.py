@@ -0,0 +1,21 @@
+# Gunicorn ayarları - çoklu worker ile copy-on-write model paylaşımı
+#
+# Kullanım:
+#   PRELOAD_MODELS=1 gunicorn main:app -c gunicorn.conf.py
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# Uygulama worker sayısını buradan okur (TF iş parçacığı "auto" ayarı çekirdekleri buna böler)
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Uygulama ana süreçte bir kez import edilir, worker'lar ardından fork edilir.
+# PRELOAD_MODELS=1 iken tokenizer ve model ağırlıkları bu aşamada okunur.
+preload_app = True
+
+
+def pre_fork(server, worker):
+    """-w ile veya TTIN/TTOU sinyalleriyle değişen worker sayısını yeni worker'a aktar"""
+    os.environ["WEB_CONCURRENCY"] = str(server.num_workers)
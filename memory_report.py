@@ -0,0 +1,171 @@
+"""
+Sunum sürecinin bellek muhasebesi.
+
+Süreç RSS'i, TensorFlow ayırıcı istatistikleri ve yüklü nesnelerin (model,
+tokenizer, önbellekler) yaklaşık boyutlarını raporlar. İsteğe bağlı
+tracemalloc anlık görüntüleri ile en çok bellek ayıran kod satırları ve iki
+görüntü arasındaki fark listelenir.
+"""
+
+import sys
+import threading
+import tracemalloc
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+
+def read_proc_status(pid="self") -> dict:
+    """RSS ve tepe RSS değerlerini kB cinsinden oku (yalnızca Linux)"""
+    fields = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM", "VmSize", "RssAnon", "RssFile", "Threads"):
+                fields[key] = int(value.split()[0])
+    return {
+        "rss_kb": fields.get("VmRSS", 0),
+        "peak_rss_kb": fields.get("VmHWM", 0),
+        "virtual_kb": fields.get("VmSize", 0),
+        "anon_kb": fields.get("RssAnon", 0),
+        "file_kb": fields.get("RssFile", 0),
+        "threads": fields.get("Threads", 0)
+    }
+
+
+def deep_sizeof(obj, seen=None) -> int:
+    """Python nesnesinin içerdikleriyle birlikte yaklaşık boyutu (bayt)"""
+    seen = set() if seen is None else seen
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if isinstance(current, np.ndarray):
+            # Görünümler verisini sahibi üzerinden sayar
+            total += current.nbytes if current.base is None else sys.getsizeof(current)
+            continue
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(current.__dict__)
+    return total
+
+
+def tokenizer_nbytes(tok) -> int:
+    """CompactTokenizer için dizi boyutları, Keras Tokenizer için sözlüklerin derin boyutu"""
+    if tok is None:
+        return 0
+    if hasattr(tok, "vocab") and hasattr(tok, "ids"):
+        return tok.vocab.nbytes + tok.ids.nbytes
+    return deep_sizeof(tok)
+
+
+def model_nbytes(model) -> int:
+    """Model ağırlıklarının boyutu"""
+    if model is None:
+        return 0
+    if hasattr(model, "weights_nbytes"):
+        return model.weights_nbytes()
+    return sum(w.nbytes for w in model.get_weights())
+
+
+def tf_allocator_stats() -> dict:
+    """TensorFlow cihaz ayırıcı istatistikleri; TensorFlow yüklenmediyse boş"""
+    if "tensorflow" not in sys.modules:
+        return {"loaded": False}
+    tf = sys.modules["tensorflow"]
+    devices = {}
+    for device in tf.config.list_logical_devices():
+        try:
+            info = tf.config.experimental.get_memory_info(device.name)
+            devices[device.name] = {"current_bytes": info["current"], "peak_bytes": info["peak"]}
+        except (ValueError, RuntimeError):
+            # CPU ayırıcısı istatistik tutmaz; CPU tensörleri RSS'e dahildir
+            devices[device.name] = None
+    return {"loaded": True, "devices": devices}
+
+
+class TracemallocTracker:
+    """Worker başına tracemalloc anlık görüntüleri (en fazla max_snapshots tutulur)"""
+
+    def __init__(self, max_snapshots: int = 5):
+        self.max_snapshots = max_snapshots
+        self.snapshots = OrderedDict()
+        self.next_id = 1
+        self.lock = threading.Lock()
+
+    def start(self, frames: int = 10):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        with self.lock:
+            self.snapshots.clear()
+        tracemalloc.stop()
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self.lock:
+            snapshots = [{"id": i, "taken_at": taken_at} for i, (_, taken_at) in self.snapshots.items()]
+        return {
+            "tracing": tracing,
+            "traced_bytes": current,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": snapshots
+        }
+
+    def snapshot(self, limit: int = 20, group_by: str = "lineno") -> dict:
+        """Anlık görüntü al ve en çok bellek ayıran yerleri döndür"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc çalışmıyor, önce başlatın")
+        snap = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        with self.lock:
+            snapshot_id = self.next_id
+            self.next_id += 1
+            self.snapshots[snapshot_id] = (snap, datetime.utcnow().isoformat())
+            while len(self.snapshots) > self.max_snapshots:
+                self.snapshots.popitem(last=False)
+        stats = snap.statistics(group_by)
+        return {
+            "id": snapshot_id,
+            "total_bytes": sum(s.size for s in stats),
+            "top": [self._format(s) for s in stats[:limit]]
+        }
+
+    def diff(self, base_id: int, target_id: int, limit: int = 20, group_by: str = "lineno") -> dict:
+        """İki anlık görüntü arasında en çok büyüyen/küçülen yerler"""
+        with self.lock:
+            if base_id not in self.snapshots or target_id not in self.snapshots:
+                raise KeyError("Anlık görüntü bulunamadı")
+            base = self.snapshots[base_id][0]
+            target = self.snapshots[target_id][0]
+        stats = target.compare_to(base, group_by)
+        return {
+            "base": base_id,
+            "target": target_id,
+            "size_diff_bytes": sum(s.size_diff for s in stats),
+            "top": [dict(self._format(s), size_diff=s.size_diff, count_diff=s.count_diff) for s in stats[:limit]]
+        }
+
+    @staticmethod
+    def _format(stat) -> dict:
+        frame = stat.traceback[0]
+        return {
+            "site": f"{frame.filename}:{frame.lineno}",
+            "traceback": [f"{f.filename}:{f.lineno}" for f in stat.traceback] if len(stat.traceback) > 1 else None,
+            "size": stat.size,
+            "count": stat.count
+        }
@@ -0,0 +1,121 @@
+"""
+Çoklu model kaydı.
+
+Modeller dizinindeki her alt klasör adlandırılmış bir modeldir (dil, operatör
+veya deneysel modeller). Modeller ilk istendiklerinde yüklenir ve toplam
+boyutları bellek bütçesini aşınca en uzun süredir kullanılmayan model
+bellekten çıkarılır.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+
+
+class ModelRegistry:
+    """Bellek bütçeli, LRU tahliyeli adlandırılmış model kaydı"""
+
+    def __init__(self, models_dir: str, budget_bytes: int, loader, size_of):
+        self.models_dir = models_dir
+        self.budget_bytes = budget_bytes
+        self.loader = loader
+        self.size_of = size_of
+        self.loaded = OrderedDict()
+        self.sizes = {}
+        self.lock = threading.Lock()
+        self.load_locks = {}
+        self.events = deque(maxlen=100)
+        self.latency = {}
+
+    def available(self) -> list:
+        """Diskte bulunan model adları"""
+        if not os.path.isdir(self.models_dir):
+            return []
+        return sorted(
+            name for name in os.listdir(self.models_dir)
+            if os.path.isdir(os.path.join(self.models_dir, name)) and not name.startswith('.')
+        )
+
+    def get(self, name: str):
+        """Modeli döndür; yüklü değilse yükle ve gerekirse başka modelleri tahliye et"""
+        with self.lock:
+            if name in self.loaded:
+                self.loaded.move_to_end(name)
+                return self.loaded[name]
+            if name not in self.available():
+                raise KeyError(name)
+            load_lock = self.load_locks.setdefault(name, threading.Lock())
+
+        # Aynı model için eşzamanlı istekler tek yüklemeyi bekler
+        with load_lock:
+            with self.lock:
+                if name in self.loaded:
+                    self.loaded.move_to_end(name)
+                    return self.loaded[name]
+
+            start = time.perf_counter()
+            state = self.loader(name, os.path.join(self.models_dir, name))
+            size = self.size_of(state)
+            elapsed = time.perf_counter() - start
+
+            with self.lock:
+                self.loaded[name] = state
+                self.sizes[name] = size
+                self._event("load", name, size, elapsed)
+                self._evict_over_budget(keep=name)
+            return state
+
+    def _evict_over_budget(self, keep: str):
+        while sum(self.sizes.values()) > self.budget_bytes and len(self.loaded) > 1:
+            victim = next(n for n in self.loaded if n != keep)
+            # Devam eden istekler modele referans tuttuğu için güvenle tamamlanır
+            del self.loaded[victim]
+            size = self.sizes.pop(victim)
+            self._event("evict", victim, size)
+
+    def evict(self, name: str) -> bool:
+        with self.lock:
+            if name not in self.loaded:
+                return False
+            del self.loaded[name]
+            self._event("evict", name, self.sizes.pop(name))
+            return True
+
+    def _event(self, kind: str, name: str, size: int, seconds: float = None):
+        event = {"event": kind, "model": name, "bytes": size, "at": datetime.utcnow().isoformat()}
+        if seconds is not None:
+            event["seconds"] = round(seconds, 3)
+        self.events.append(event)
+        print(f"Model kaydı: {kind} {name} ({size / 1024 / 1024:.1f} MB)")
+
+    def record_inference(self, name: str, seconds: float, messages: int):
+        """Model çağrısı süresini model adına göre kaydet"""
+        with self.lock:
+            stats = self.latency.setdefault(name, {"calls": 0, "messages": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["calls"] += 1
+            stats["messages"] += messages
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+    def report(self) -> dict:
+        with self.lock:
+            loaded = [
+                {"name": name, "version": state.version, "bytes": self.sizes[name]}
+                for name, state in self.loaded.items()
+            ]
+            latency = {
+                name: dict(stats, avg_ms=stats["total_seconds"] / stats["calls"] * 1000 if stats["calls"] else 0.0)
+                for name, stats in self.latency.items()
+            }
+            events = list(self.events)
+        return {
+            "models_dir": self.models_dir,
+            "available": self.available(),
+            "budget_bytes": self.budget_bytes,
+            "used_bytes": sum(m["bytes"] for m in loaded),
+            "loaded": loaded,
+            "latency": latency,
+            "events": events
+        }
@@ -0,0 +1,131 @@
+"""
+Yakın kopya spam tespiti için SimHash indeksi.
+
+Spam kampanyaları aynı şablonun küçük varyasyonlarını gönderir. Yüksek güvenle
+sınıflandırılmış son mesajların 64 bitlik SimHash parmak izleri tutulur; yeni
+mesaj bunlardan birine yeterince yakınsa önceki karar modele gitmeden
+yeniden kullanılır.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+FINGERPRINT_BITS = 64
+
+
+def _feature_hashes(tokens: list) -> np.ndarray:
+    """Kelime ve kelime ikililerinin 64 bitlik hash'leri"""
+    shingles = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    digests = b''.join(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest() for s in shingles)
+    return np.frombuffer(digests, dtype=np.uint8).reshape(len(shingles), 8)
+
+
+def simhash(tokens: list) -> int:
+    """Token listesinin SimHash parmak izi"""
+    bits = np.unpackbits(_feature_hashes(tokens), axis=1)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - bits.shape[0]
+    fingerprint = 0
+    for bit in np.flatnonzero(votes > 0):
+        fingerprint |= 1 << (FINGERPRINT_BITS - 1 - int(bit))
+    return fingerprint
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """Sınırlı boyutlu, LRU tahliyeli SimHash indeksi
+
+    Parmak izi eşit bantlara bölünür; Hamming mesafesi bant sayısından küçük
+    olan iki parmak izi güvercin yuvası ilkesi gereği en az bir bantta
+    birebir eşleşir, bu yüzden adaylar yalnızca bant kovalarından okunur.
+    """
+
+    def __init__(self, max_entries: int = 50000, max_distance: int = 5, min_tokens: int = 5):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.min_tokens = min_tokens
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self.entries = OrderedDict()
+        self.buckets = [dict() for _ in range(self.bands)]
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.stats = {
+            "lookups": 0,
+            "hits": 0,
+            "inserts": 0,
+            "evictions": 0,
+            "verified": 0,
+            "disagreements": 0
+        }
+
+    def _band_keys(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (i * self.band_bits)) & mask for i in range(self.bands)]
+
+    def fingerprint(self, cleaned_text: str):
+        """Çok kısa mesajlar için parmak izi güvenilir değil, None döner"""
+        tokens = cleaned_text.split()
+        if len(tokens) < self.min_tokens:
+            return None
+        return simhash(tokens)
+
+    def lookup(self, fingerprint: int, version: str):
+        """Aynı model sürümünden en yakın kaydın (skor, mesafe) bilgisini döndür"""
+        with self.lock:
+            self.stats["lookups"] += 1
+            best = None
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                for entry_id in self.buckets[band].get(key, ()):
+                    entry_fp, score, entry_version = self.entries[entry_id]
+                    if entry_version != version:
+                        continue
+                    distance = hamming(fingerprint, entry_fp)
+                    if distance <= self.max_distance and (best is None or distance < best[2]):
+                        best = (entry_id, score, distance)
+            if best is None:
+                return None
+            self.entries.move_to_end(best[0])
+            self.stats["hits"] += 1
+            return best[1], best[2]
+
+    def insert(self, fingerprint: int, score: float, version: str):
+        with self.lock:
+            entry_id = self.next_id
+            self.next_id += 1
+            self.entries[entry_id] = (fingerprint, score, version)
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                self.buckets[band].setdefault(key, set()).add(entry_id)
+            self.stats["inserts"] += 1
+            while len(self.entries) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self):
+        entry_id, (fingerprint, _, _) = self.entries.popitem(last=False)
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self.buckets[band][key]
+        self.stats["evictions"] += 1
+
+    def record_verification(self, agreed: bool):
+        """Örneklenen tam model çıkarımıyla karşılaştırma sonucunu kaydet"""
+        with self.lock:
+            self.stats["verified"] += 1
+            if not agreed:
+                self.stats["disagreements"] += 1
+
+    def report(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["size"] = len(self.entries)
+        stats["reuse_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        stats["disagreement_rate"] = stats["disagreements"] / stats["verified"] if stats["verified"] else 0.0
+        return stats
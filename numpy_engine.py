@@ -0,0 +1,309 @@
+"""
+TensorFlow gerektirmeyen NumPy çıkarım motoru.
+
+`export` komutu sms_model.h5 içindeki katman yapısını ve ağırlıkları, tokenizer
+sözlüğüyle birlikte tek bir .npz dosyasına yazar. NumpyModel bu dosyayı okuyup
+Keras'ın ileri geçişini vektörize NumPy işlemleriyle yeniden üretir; böylece
+API worker'ları tensorflow import etmeden tahmin yapabilir.
+
+Kullanım:
+    python numpy_engine.py export model/sms_model.h5 model/tokenizer.pkl model/sms_model.npz
+"""
+
+import json
+import pickle
+
+import numpy as np
+
+from preload import CompactTokenizer, read_h5_weights
+
+# İleri geçişte ağırlık gerektirmeyen, çıkarımda etkisiz katmanlar
+IDENTITY_LAYERS = {"InputLayer", "Dropout", "SpatialDropout1D", "GaussianNoise", "GaussianDropout", "ActivityRegularization"}
+
+SUPPORTED_LAYERS = IDENTITY_LAYERS | {
+    "Embedding", "Dense", "Activation", "Flatten", "GlobalAveragePooling1D", "GlobalMaxPooling1D",
+    "Conv1D", "SimpleRNN", "LSTM", "GRU", "Bidirectional"
+}
+
+
+def pad_sequences(sequences, maxlen: int, padding: str = 'pre', truncating: str = 'pre', value: int = 0) -> np.ndarray:
+    """keras.preprocessing.sequence.pad_sequences ile aynı sonucu üretir"""
+    x = np.full((len(sequences), maxlen), value, dtype=np.int32)
+    for i, seq in enumerate(sequences):
+        if not len(seq):
+            continue
+        trunc = seq[-maxlen:] if truncating == 'pre' else seq[:maxlen]
+        if padding == 'post':
+            x[i, :len(trunc)] = trunc
+        else:
+            x[i, -len(trunc):] = trunc
+    return x
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def hard_sigmoid(x):
+    return np.clip(0.2 * x + 0.5, 0.0, 1.0)
+
+
+def softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    None: lambda x: x,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "sigmoid": sigmoid,
+    "hard_sigmoid": hard_sigmoid,
+    "tanh": np.tanh,
+    "softmax": softmax,
+    "elu": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0.0))),
+    "swish": lambda x: x * sigmoid(x),
+}
+
+
+def activation(name):
+    if isinstance(name, dict):
+        name = name.get("config", {}).get("name", name.get("class_name"))
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Desteklenmeyen aktivasyon: {name}")
+    return ACTIVATIONS[name]
+
+
+def _layer_configs(model_config: dict) -> list:
+    """Sequential veya doğrusal Functional model yapısından katman listesini çıkar"""
+    config = model_config["config"]
+    layers = config["layers"] if isinstance(config, dict) else config
+    specs = []
+    for layer in layers:
+        class_name = layer["class_name"]
+        if class_name not in SUPPORTED_LAYERS:
+            raise ValueError(f"Desteklenmeyen katman: {class_name}")
+        specs.append({"class_name": class_name, "config": layer["config"]})
+    return specs
+
+
+def _weights_by_layer(model_path: str) -> dict:
+    """Ağırlıkları katman adına göre grupla (h5 içindeki sırayla)"""
+    import h5py
+
+    grouped = {}
+    with h5py.File(model_path, 'r') as f:
+        group = f['model_weights'] if 'model_weights' in f else f
+        for layer_name in group.attrs['layer_names']:
+            layer_name = layer_name.decode('utf-8') if isinstance(layer_name, bytes) else layer_name
+            layer_group = group[layer_name]
+            names = [n.decode('utf-8') if isinstance(n, bytes) else n for n in layer_group.attrs['weight_names']]
+            grouped[layer_name] = [np.asarray(layer_group[n]) for n in names]
+    return grouped
+
+
+def export_model(model_path: str, tokenizer_path: str, output_path: str):
+    """h5 modeli ve tokenizer'ı NumPy motorunun okuyacağı .npz dosyasına yaz"""
+    config_json, _ = read_h5_weights(model_path)
+    specs = _layer_configs(json.loads(config_json))
+    weights = _weights_by_layer(model_path)
+
+    arrays = {}
+    for i, spec in enumerate(specs):
+        for j, w in enumerate(weights.get(spec["config"]["name"], [])):
+            arrays[f"w_{i}_{j}"] = w.astype(np.float32)
+        spec["n_weights"] = len(weights.get(spec["config"]["name"], []))
+
+    with open(tokenizer_path, 'rb') as f:
+        keras_tokenizer = pickle.load(f)
+    tokenizer = CompactTokenizer.from_keras(keras_tokenizer)
+    arrays.update(tokenizer.to_arrays())
+
+    np.savez(output_path, layers=np.array(json.dumps(specs)), **arrays)
+    print(f"✅ {len(specs)} katman, {sum(a.nbytes for a in arrays.values()) / 1024 / 1024:.1f} MB -> {output_path}")
+
+
+class NumpyModel:
+    """Dışa aktarılmış modelin NumPy ileri geçişi; Keras predict arayüzünü taklit eder"""
+
+    def __init__(self, specs: list, weights: list, tokenizer: CompactTokenizer = None):
+        self.specs = specs
+        self.weights = weights
+        self.tokenizer = tokenizer
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        specs = json.loads(str(data["layers"]))
+        weights = []
+        for i, spec in enumerate(specs):
+            layer_weights = []
+            for j in range(spec["n_weights"]):
+                w = data[f"w_{i}_{j}"]
+                w.flags.writeable = False
+                layer_weights.append(w)
+            weights.append(layer_weights)
+        tokenizer = CompactTokenizer.from_arrays(data) if "tokenizer_vocab" in data.files else None
+        return cls(specs, weights, tokenizer)
+
+    def weights_nbytes(self) -> int:
+        return sum(w.nbytes for layer in self.weights for w in layer)
+
+    def predict(self, x, batch_size: int = None, verbose: int = 0) -> np.ndarray:
+        x = np.asarray(x)
+        if batch_size is None or len(x) <= batch_size:
+            return self._forward(x)
+        return np.concatenate([self._forward(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+    def _forward(self, x):
+        mask = None
+        out = x
+        for spec, w in zip(self.specs, self.weights):
+            out, mask = self._apply(spec["class_name"], spec["config"], w, out, mask)
+        return out.astype(np.float32)
+
+    def _apply(self, class_name, cfg, w, x, mask):
+        if class_name in IDENTITY_LAYERS:
+            return x, mask
+        if class_name == "Embedding":
+            mask = x != 0 if cfg.get("mask_zero") else None
+            return w[0][x], mask
+        if class_name == "Dense":
+            y = x @ w[0]
+            if len(w) > 1:
+                y = y + w[1]
+            return activation(cfg.get("activation"))(y), mask
+        if class_name == "Activation":
+            return activation(cfg.get("activation"))(x), mask
+        if class_name == "Flatten":
+            return x.reshape(len(x), -1), None
+        if class_name == "GlobalAveragePooling1D":
+            if mask is None:
+                return x.mean(axis=1), None
+            m = mask[:, :, None].astype(x.dtype)
+            return (x * m).sum(axis=1) / np.maximum(m.sum(axis=1), 1.0), None
+        if class_name == "GlobalMaxPooling1D":
+            return x.max(axis=1), None
+        if class_name == "Conv1D":
+            return self._conv1d(cfg, w, x), None
+        if class_name == "Bidirectional":
+            return self._bidirectional(cfg, w, x, mask)
+        return self._rnn(class_name, cfg, w, x, mask, go_backwards=cfg.get("go_backwards", False))
+
+    def _conv1d(self, cfg, w, x):
+        kernel = w[0]  # (k, in, out)
+        k = kernel.shape[0]
+        dilation = cfg.get("dilation_rate", [1])[0]
+        stride = cfg.get("strides", [1])[0]
+        span = (k - 1) * dilation + 1
+        if cfg.get("padding") == "same":
+            total = max(span - 1, 0)
+            x = np.pad(x, ((0, 0), (total // 2, total - total // 2), (0, 0)))
+        elif cfg.get("padding") == "causal":
+            x = np.pad(x, ((0, 0), (span - 1, 0), (0, 0)))
+        steps = (x.shape[1] - span) // stride + 1
+        y = np.zeros((x.shape[0], steps, kernel.shape[2]), dtype=np.float32)
+        for i in range(k):
+            start = i * dilation
+            y += x[:, start:start + (steps - 1) * stride + 1:stride, :] @ kernel[i]
+        if cfg.get("use_bias", True):
+            y += w[1]
+        return activation(cfg.get("activation"))(y)
+
+    def _bidirectional(self, cfg, w, x, mask):
+        inner = cfg["layer"]
+        class_name, inner_cfg = inner["class_name"], inner["config"]
+        half = len(w) // 2
+        # Keras, Bidirectional içinde maskelenmiş adımların çıktısını sıfırlar
+        forward, _ = self._rnn(class_name, inner_cfg, w[:half], x, mask, go_backwards=False,
+                               zero_output_for_mask=True)
+        backward, _ = self._rnn(class_name, inner_cfg, w[half:], x, mask, go_backwards=True,
+                                zero_output_for_mask=True)
+        if inner_cfg.get("return_sequences"):
+            backward = backward[:, ::-1]
+        merge = cfg.get("merge_mode", "concat")
+        if merge == "concat":
+            out = np.concatenate([forward, backward], axis=-1)
+        elif merge == "sum":
+            out = forward + backward
+        elif merge == "mul":
+            out = forward * backward
+        elif merge == "ave":
+            out = (forward + backward) / 2
+        else:
+            raise ValueError(f"Desteklenmeyen merge_mode: {merge}")
+        return out, mask if inner_cfg.get("return_sequences") else None
+
+    def _rnn(self, class_name, cfg, w, x, mask, go_backwards=False, zero_output_for_mask=False):
+        """SimpleRNN / LSTM / GRU; girdi projeksiyonu tüm adımlar için tek matris çarpımıyla yapılır"""
+        units = cfg["units"]
+        act = activation(cfg.get("activation", "tanh"))
+        rec_act = activation(cfg.get("recurrent_activation", "sigmoid"))
+        kernel, recurrent = w[0], w[1]
+        bias = w[2] if len(w) > 2 else None
+        batch, steps = x.shape[0], x.shape[1]
+
+        reset_after = class_name == "GRU" and cfg.get("reset_after", True)
+        if reset_after and bias is not None:
+            input_bias, recurrent_bias = bias[0], bias[1]
+        else:
+            input_bias, recurrent_bias = bias, None
+
+        projected = x @ kernel
+        if input_bias is not None:
+            projected = projected + input_bias
+
+        order = range(steps - 1, -1, -1) if go_backwards else range(steps)
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        outputs = []
+        for t in order:
+            xt = projected[:, t]
+            if class_name == "LSTM":
+                z = xt + h @ recurrent
+                i = rec_act(z[:, :units])
+                f = rec_act(z[:, units:2 * units])
+                c_new = f * c + i * act(z[:, 2 * units:3 * units])
+                o = rec_act(z[:, 3 * units:])
+                h_new = o * act(c_new)
+            elif class_name == "GRU":
+                if reset_after:
+                    hr = h @ recurrent
+                    if recurrent_bias is not None:
+                        hr = hr + recurrent_bias
+                    z = rec_act(xt[:, :units] + hr[:, :units])
+                    r = rec_act(xt[:, units:2 * units] + hr[:, units:2 * units])
+                    hh = act(xt[:, 2 * units:] + r * hr[:, 2 * units:])
+                else:
+                    z = rec_act(xt[:, :units] + h @ recurrent[:, :units])
+                    r = rec_act(xt[:, units:2 * units] + h @ recurrent[:, units:2 * units])
+                    hh = act(xt[:, 2 * units:] + (r * h) @ recurrent[:, 2 * units:])
+                h_new = z * h + (1 - z) * hh
+                c_new = c
+            elif class_name == "SimpleRNN":
+                h_new = act(xt + h @ recurrent)
+                c_new = c
+            else:
+                raise ValueError(f"Desteklenmeyen katman: {class_name}")
+
+            if mask is not None:
+                m = mask[:, t][:, None]
+                h = np.where(m, h_new, h)
+                c = np.where(m, c_new, c)
+                outputs.append(np.where(m, h, 0.0) if zero_output_for_mask else h)
+            else:
+                h, c = h_new, c_new
+                outputs.append(h)
+
+        if cfg.get("return_sequences"):
+            return np.stack(outputs, axis=1), mask
+        return h, None
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 5 or sys.argv[1] != "export":
+        print("Kullanım: python numpy_engine.py export <model.h5> <tokenizer.pkl> <çıktı.npz>")
+        sys.exit(1)
+    export_model(sys.argv[2], sys.argv[3], sys.argv[4])
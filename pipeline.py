@@ -0,0 +1,92 @@
+"""
+Büyük batch'ler için aşamalı ön işleme ve çıkarım hattı.
+
+Mesajlar parçalara bölünür; tek bir ön işleme iş parçacığı (temizleme, yakın
+kopya, cascade, tokenize, padding) sıradaki parçayı hazırlarken çağıran iş
+parçacığı mevcut parçayı modelle skorlar. Model çağrısı GIL'i bıraktığı için
+iki aşama gerçekten örtüşür. Ön işleme saf Python'dur ve GIL'i tutar; ikinci
+bir ön işleme iş parçacığı hız kazandırmaz, kazanç yalnızca bu örtüşmedir. Hazırlanmış ama skorlanmamış parça sayısı
+sınırlıdır, bellek kullanımı batch boyutundan bağımsız kalır.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StagedPipeline:
+    """prepare_fn(chunk, state) -> hazırlanmış parça, score_fn(hazırlanmış, state) -> sonuçlar"""
+
+    def __init__(self, prepare_fn, score_fn, chunk_size: int = 256, max_pending: int = 2):
+        self.prepare_fn = prepare_fn
+        self.score_fn = score_fn
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preprocess")
+        self.lock = threading.Lock()
+        self.stats = {
+            "runs": 0,
+            "chunks": 0,
+            "messages": 0,
+            "wall_seconds": 0.0,
+            "prepare_seconds": 0.0,
+            "score_seconds": 0.0,
+            "score_wait_seconds": 0.0
+        }
+
+    def _timed_prepare(self, chunk: list, state):
+        start = time.perf_counter()
+        prepared = self.prepare_fn(chunk, state)
+        return prepared, time.perf_counter() - start
+
+    def run(self, messages: list, state) -> list:
+        """Mesajları parça parça skorla; sonuçlar girdi sırasıyla döner"""
+        start = time.perf_counter()
+        chunks = [messages[i:i + self.chunk_size] for i in range(0, len(messages), self.chunk_size)]
+        pending = deque()
+        results = []
+        next_chunk = 0
+        prepare_seconds = score_seconds = wait_seconds = 0.0
+        try:
+            while next_chunk < len(chunks) or pending:
+                # Sınırlı kuyruk: en fazla max_pending parça önden hazırlanır
+                while next_chunk < len(chunks) and len(pending) < self.max_pending:
+                    pending.append(self.executor.submit(self._timed_prepare, chunks[next_chunk], state))
+                    next_chunk += 1
+                waited = time.perf_counter()
+                prepared, elapsed = pending.popleft().result()
+                wait_seconds += time.perf_counter() - waited
+                prepare_seconds += elapsed
+
+                scored = time.perf_counter()
+                results.extend(self.score_fn(prepared, state))
+                score_seconds += time.perf_counter() - scored
+        finally:
+            for future in pending:
+                future.cancel()
+
+        with self.lock:
+            self.stats["runs"] += 1
+            self.stats["chunks"] += len(chunks)
+            self.stats["messages"] += len(messages)
+            self.stats["wall_seconds"] += time.perf_counter() - start
+            self.stats["prepare_seconds"] += prepare_seconds
+            self.stats["score_seconds"] += score_seconds
+            self.stats["score_wait_seconds"] += wait_seconds
+        return results
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+    def report(self) -> dict:
+        """Aşama doluluk oranları: skorlama ~1 ise model, bekleme yüksekse ön işleme darboğazdır"""
+        with self.lock:
+            stats = dict(self.stats)
+        wall = stats["wall_seconds"]
+        stats["prepare_utilization"] = stats["prepare_seconds"] / wall if wall else 0.0
+        stats["score_utilization"] = stats["score_seconds"] / wall if wall else 0.0
+        stats["score_starved_fraction"] = stats["score_wait_seconds"] / wall if wall else 0.0
+        stats["chunk_size"] = self.chunk_size
+        stats["max_pending"] = self.max_pending
+        return stats
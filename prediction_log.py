@@ -0,0 +1,95 @@
+"""
+Write-behind tahmin kaydı.
+
+Tahmin sonuçları istek yolunda yalnızca bellekteki sınırlı bir tampona eklenir.
+Arka plan iş parçacığı tamponu belirli boyut veya süre dolduğunda çok satırlı
+INSERT'lerle veritabanına yazar; böylece /predict yoluna veritabanı gidiş
+dönüşü eklenmez.
+"""
+
+import threading
+from collections import deque
+
+
+class PredictionLog:
+    """Sınırlı tamponlu, toplu yazan tahmin kaydı"""
+
+    def __init__(self, engine, table, flush_size: int = 500, flush_interval: float = 1.0,
+                 max_buffer: int = 100000):
+        self.engine = engine
+        self.table = table
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.buffer = deque()
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = None
+        self.stats = {"logged": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def append(self, record: dict) -> bool:
+        """Kaydı tampona ekle; tampon doluysa kaydı at ve sayacı artır"""
+        with self.lock:
+            if len(self.buffer) >= self.max_buffer:
+                self.stats["dropped"] += 1
+                return False
+            self.buffer.append(record)
+            self.stats["logged"] += 1
+            full = len(self.buffer) >= self.flush_size
+        if full:
+            self.wakeup.set()
+        return True
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="prediction-log", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Arka plan iş parçacığını durdur, kalan kayıtları yaz"""
+        self.stopping.set()
+        self.wakeup.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+        self.flush()
+
+    def _run(self):
+        while not self.stopping.is_set():
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """Tampondaki tüm kayıtları flush_size'lık gruplar halinde yaz"""
+        while True:
+            with self.lock:
+                if not self.buffer:
+                    return
+                count = min(self.flush_size, len(self.buffer))
+                batch = [self.buffer.popleft() for _ in range(count)]
+            self._write(batch)
+
+    def _write(self, batch: list):
+        try:
+            # executemany: PostgreSQL'de psycopg2 çok satırlı VALUES, SQLite'ta tek işlem
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), batch)
+            with self.lock:
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+        except Exception as e:
+            print(f"Tahmin kaydı yazma hatası ({len(batch)} kayıt): {e}")
+            with self.lock:
+                self.stats["failed"] += len(batch)
+
+    def report(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["buffered"] = len(self.buffer)
+        stats["flush_size"] = self.flush_size
+        stats["flush_interval"] = self.flush_interval
+        stats["max_buffer"] = self.max_buffer
+        return stats
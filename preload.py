@@ -0,0 +1,242 @@
+"""
+Çoklu worker dağıtımları için model ön yükleme yardımcıları.
+
+Tokenizer sözlüğü ve model ağırlıkları fork'tan önce ana süreçte bir kez
+okunur ve az sayıda büyük NumPy dizisinde tutulur. Böylece worker'lar bu
+sayfaları copy-on-write olarak paylaşır; binlerce küçük Python nesnesinin
+referans sayacı güncellemeleri sayfaları kopyalatmaz.
+"""
+
+import gc
+import json
+import os
+import pickle
+
+import numpy as np
+
+
+class CompactTokenizer:
+    """Keras Tokenizer'ın texts_to_sequences davranışını NumPy dizileriyle taklit eder"""
+
+    def __init__(self, word_index: dict, oov_token=None, num_words=None,
+                 filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n', lower=True, split=' '):
+        encoded = sorted((word.encode('utf-8'), index) for word, index in word_index.items())
+        width = max((len(word) for word, _ in encoded), default=1)
+        self.vocab = np.array([word for word, _ in encoded], dtype=f'S{width}')
+        self.ids = np.array([index for _, index in encoded], dtype=np.int32)
+        self.vocab.flags.writeable = False
+        self.ids.flags.writeable = False
+        self.width = width
+        self.oov_index = word_index.get(oov_token) if oov_token is not None else None
+        self.num_words = num_words
+        self.lower = lower
+        self.split = split
+        self.translate_map = str.maketrans({c: split for c in filters})
+
+    @classmethod
+    def from_keras(cls, tokenizer):
+        """Pickle'dan okunan Keras Tokenizer'ından oluştur"""
+        return cls(
+            tokenizer.word_index,
+            oov_token=tokenizer.oov_token,
+            num_words=tokenizer.num_words,
+            filters=tokenizer.filters,
+            lower=tokenizer.lower,
+            split=tokenizer.split
+        )
+
+    def to_arrays(self) -> dict:
+        """.npz dosyasına yazılabilecek diziler"""
+        return {
+            "tokenizer_vocab": self.vocab,
+            "tokenizer_ids": self.ids,
+            "tokenizer_config": np.array(json.dumps({
+                "oov_index": self.oov_index,
+                "num_words": self.num_words,
+                "lower": self.lower,
+                "split": self.split,
+                "filters": "".join(chr(c) for c in self.translate_map)
+            }))
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """to_arrays çıktısından, Keras'ı import etmeden oluştur"""
+        config = json.loads(str(arrays["tokenizer_config"]))
+        tokenizer = cls.__new__(cls)
+        tokenizer.vocab = arrays["tokenizer_vocab"]
+        tokenizer.ids = arrays["tokenizer_ids"]
+        tokenizer.vocab.flags.writeable = False
+        tokenizer.ids.flags.writeable = False
+        tokenizer.width = tokenizer.vocab.dtype.itemsize
+        tokenizer.oov_index = config["oov_index"]
+        tokenizer.num_words = config["num_words"]
+        tokenizer.lower = config["lower"]
+        tokenizer.split = config["split"]
+        tokenizer.translate_map = str.maketrans({c: config["split"] for c in config["filters"]})
+        return tokenizer
+
+    def lookup(self, words: list) -> np.ndarray:
+        """Kelimelerin indekslerini döndür, sözlükte olmayanlar için -1"""
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        encoded = [w.encode('utf-8') for w in words]
+        # Genişlikten uzun kelimeler S dtype'ında kırpılıp yanlış eşleşebilir
+        too_long = np.array([len(w) > self.width for w in encoded])
+        query = np.array(encoded, dtype=self.vocab.dtype)
+        pos = np.searchsorted(self.vocab, query)
+        pos = np.minimum(pos, len(self.vocab) - 1)
+        found = (self.vocab[pos] == query) & ~too_long
+        return np.where(found, self.ids[pos], -1)
+
+    def texts_to_sequences(self, texts: list) -> list:
+        """Metinleri indeks dizilerine çevir"""
+        sequences = []
+        for text in texts:
+            if self.lower:
+                text = text.lower()
+            words = [w for w in text.translate(self.translate_map).split(self.split) if w]
+            indices = self.lookup(words)
+            if self.num_words:
+                indices = np.where(indices >= self.num_words, -1, indices)
+            if self.oov_index is not None:
+                indices = np.where(indices < 0, self.oov_index, indices)
+            else:
+                indices = indices[indices >= 0]
+            sequences.append(indices.tolist())
+        return sequences
+
+
+def read_h5_weights(model_path: str):
+    """Keras .h5 dosyasından model yapısını ve ağırlıkları TensorFlow çalıştırmadan oku"""
+    import h5py
+
+    with h5py.File(model_path, 'r') as f:
+        config = f.attrs['model_config']
+        if isinstance(config, bytes):
+            config = config.decode('utf-8')
+        group = f['model_weights'] if 'model_weights' in f else f
+        weights = []
+        for layer_name in group.attrs['layer_names']:
+            layer_name = layer_name.decode('utf-8') if isinstance(layer_name, bytes) else layer_name
+            layer_group = group[layer_name]
+            for weight_name in layer_group.attrs['weight_names']:
+                weight_name = weight_name.decode('utf-8') if isinstance(weight_name, bytes) else weight_name
+                array = np.asarray(layer_group[weight_name])
+                array.flags.writeable = False
+                weights.append(array)
+    return config, weights
+
+
+class PreloadedArtifacts:
+    """Ana süreçte fork öncesi okunan model yapısı, ağırlıklar ve tokenizer"""
+
+    def __init__(self, model_config: str, weights: list, tokenizer: CompactTokenizer, version: str,
+                 model=None):
+        self.model_config = model_config
+        self.weights = weights
+        self.tokenizer = tokenizer
+        self.version = version
+        # NumPy motorunda model doğrudan paylaşılan ağırlıklarla çalışır
+        self.model = model
+
+    def weights_nbytes(self) -> int:
+        return sum(w.nbytes for w in self.weights)
+
+    def build_model(self):
+        """Worker'da kullanılacak modeli döndür"""
+        if self.model is not None:
+            return self.model
+        return self.build_keras_model()
+
+    def build_keras_model(self):
+        """Worker içinde Keras modelini ön yüklenmiş ağırlıklarla kur"""
+        import tensorflow as tf
+
+        model = tf.keras.models.model_from_json(self.model_config)
+        model.set_weights(self.weights)
+        return model
+
+
+def preload_artifacts(model_path: str, tokenizer_path: str, version: str) -> PreloadedArtifacts:
+    """Fork öncesi model ve tokenizer'ı paylaşılabilir yapılara yükle"""
+    config, weights = read_h5_weights(model_path)
+    with open(tokenizer_path, 'rb') as f:
+        keras_tokenizer = pickle.load(f)
+    compact = CompactTokenizer.from_keras(keras_tokenizer)
+    # Kullanılmayan sayım sözlükleri dahil tüm Python nesnelerini bırak
+    del keras_tokenizer
+    gc.collect()
+    # Kalan nesneleri kalıcı nesle taşı, GC taraması sayfaları kopyalatmasın
+    gc.freeze()
+    print(f"Ön yükleme tamamlandı: {len(compact.ids)} kelime, "
+          f"{sum(w.nbytes for w in weights) / 1024 / 1024:.1f} MB ağırlık")
+    return PreloadedArtifacts(config, weights, compact, version)
+
+
+def preload_numpy_model(npz_path: str, version: str) -> PreloadedArtifacts:
+    """NumPy motoru için modeli fork öncesi yükle; ağırlıklar worker'larla doğrudan paylaşılır"""
+    from numpy_engine import NumpyModel
+
+    numpy_model = NumpyModel.load(npz_path)
+    gc.collect()
+    gc.freeze()
+    weights = [w for layer in numpy_model.weights for w in layer]
+    print(f"Ön yükleme tamamlandı (NumPy): {len(numpy_model.tokenizer.ids)} kelime, "
+          f"{numpy_model.weights_nbytes() / 1024 / 1024:.1f} MB ağırlık")
+    return PreloadedArtifacts(None, weights, numpy_model.tokenizer, version, model=numpy_model)
+
+
+def read_smaps_rollup(pid) -> dict:
+    """Sürecin bellek özetini kB cinsinden oku (yalnızca Linux)"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        "pid": int(pid),
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "shared_kb": fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0),
+        "unique_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    }
+
+
+def child_pids(pid) -> list:
+    """Bir sürecin doğrudan alt süreçlerini listele"""
+    children = []
+    task_dir = f"/proc/{pid}/task"
+    for tid in os.listdir(task_dir):
+        try:
+            with open(f"{task_dir}/{tid}/children") as f:
+                children.extend(int(c) for c in f.read().split())
+        except OSError:
+            continue
+    return children
+
+
+def worker_memory_report(parent_pid=None) -> dict:
+    """Ana süreç ve tüm worker'lar için paylaşılan/özel bellek raporu"""
+    parent_pid = parent_pid or os.getppid()
+    workers = []
+    for pid in child_pids(parent_pid):
+        try:
+            workers.append(read_smaps_rollup(pid))
+        except OSError:
+            continue
+    return {
+        "parent": read_smaps_rollup(parent_pid),
+        "workers": workers,
+        "total_unique_kb": sum(w["unique_kb"] for w in workers),
+        "total_pss_kb": sum(w["pss_kb"] for w in workers)
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Kullanım: python preload.py <gunicorn_master_pid>
+    report = worker_memory_report(int(sys.argv[1]))
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Trafik Yeniden Oynatma Scripti
+TRAFFIC_CAPTURE_PATH ile kaydedilen istekleri çalışan bir API'ye orijinal
+zamanlamayla (veya hızlandırılmış/yavaşlatılmış olarak) yeniden gönderir ve
+gecikme yüzdeliklerini ölçer. İki koşunun sonuçları karşılaştırılabilir.
+
+Kullanım:
+    python replay_traffic.py replay captures/traffic.*.ndjson.gz --out run_a.ndjson
+    python replay_traffic.py replay captures/traffic.*.ndjson.gz --speed 2 --out run_b.ndjson
+    python replay_traffic.py compare run_a.ndjson run_b.ndjson
+"""
+
+import argparse
+import base64
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from traffic_capture import open_capture
+
+PERCENTILES = (50, 90, 99)
+
+def load_capture(paths):
+    """Worker dosyalarını birleştir ve zamana göre sırala"""
+    records = []
+    for path in paths:
+        with open_capture(path, "r") as f:
+            try:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+            except (EOFError, json.JSONDecodeError):
+                # Kapanmadan kopyalanan dosyanın yarım kalan sonu
+                print(f"Uyarı: {path} yarım kalmış, okunabilen kısım kullanılıyor", file=sys.stderr)
+    records.sort(key=lambda r: r["ts"])
+    return records
+
+def token_expiry(token):
+    """JWT'nin exp alanı (doğrulamadan okunur); okunamazsa None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+    except (IndexError, ValueError):
+        return None
+
+class TokenManager:
+    """Access token'ı süresi dolmadan veya 401 alındığında yeniler
+
+    Önce /token/refresh denenir, başarısızsa kullanıcı adı ve şifreyle
+    yeniden giriş yapılır.
+    """
+
+    def __init__(self, base_url, username, password, margin=60.0):
+        self.base_url = base_url
+        self.username = username
+        self.password = password
+        self.margin = margin
+        self.lock = threading.Lock()
+        self.renewals = 0
+        self.access_token = None
+        self.refresh_token = None
+        self.expires_at = None
+        self._login()
+
+    def _store(self, payload):
+        self.access_token = payload["access_token"]
+        self.refresh_token = payload.get("refresh_token") or self.refresh_token
+        self.expires_at = token_expiry(self.access_token)
+
+    def _login(self):
+        response = requests.post(f"{self.base_url}/token",
+                                 json={"username": self.username, "password": self.password})
+        response.raise_for_status()
+        self._store(response.json())
+
+    def _renew(self):
+        self.renewals += 1
+        if self.refresh_token:
+            response = requests.post(f"{self.base_url}/token/refresh", json={"refresh_token": self.refresh_token})
+            if response.status_code == 200:
+                self._store(response.json())
+                return
+        self._login()
+
+    def current(self):
+        """Geçerli token; süresinin dolmasına margin saniyeden az kaldıysa önce yenilenir"""
+        with self.lock:
+            if self.expires_at is not None and time.time() > self.expires_at - self.margin:
+                self._renew()
+            return self.access_token
+
+    def invalidate(self, token):
+        """Sunucu token'ı reddetti; başka bir iş parçacığı zaten yenilemediyse yenile"""
+        with self.lock:
+            if token == self.access_token:
+                self._renew()
+
+class Replayer:
+    """Kayıtları zamanlamasına göre gönderir; yanıt beklemek sonraki gönderimi geciktirmez"""
+
+    def __init__(self, base_url, username, password, concurrency):
+        self.base_url = base_url.rstrip("/")
+        self.username = username
+        self.password = password
+        self.tokens = TokenManager(self.base_url, username, password)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.local = threading.local()
+        self.results = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+        return self.local.session
+
+    def post(self, endpoint, record, body, params):
+        if endpoint == "/token":
+            # Kayıttaki başarısız girişler geçersiz şifreyle tekrarlanır, aynı yol ölçülür
+            password = self.password if record.get("status") in (None, 200) else self.password + "-invalid"
+            return self.session().post(f"{self.base_url}/token",
+                                       json={"username": self.username, "password": password})
+        headers = {"Authorization": f"Bearer {self.tokens.current()}"}
+        if endpoint == "/predict":
+            return self.session().post(f"{self.base_url}/predict", params=params, headers=headers,
+                                       json={"message": body["message"]})
+        return self.session().post(f"{self.base_url}/predict/batch", params=params, headers=headers,
+                                   json=body["messages"])
+
+    def send(self, record, scheduled):
+        endpoint = record["ep"]
+        body = record.get("body") or {}
+        params = {"model": body["model"]} if body.get("model") else None
+        sent = time.perf_counter()
+        retried = False
+        try:
+            response = self.post(endpoint, record, body, params)
+            if response.status_code == 401 and endpoint != "/token":
+                # Token süresi dolmuş: yenile ve isteği bir kez tekrarla; gecikme tekrardan ölçülür
+                self.tokens.invalidate(response.request.headers["Authorization"][len("Bearer "):])
+                retried = True
+                sent = time.perf_counter()
+                response = self.post(endpoint, record, body, params)
+            status_code = response.status_code
+        except requests.RequestException:
+            status_code = 0
+        done = time.perf_counter()
+        with self.lock:
+            self.results.append({
+                "ep": endpoint,
+                "status": status_code,
+                "captured_status": record.get("status"),
+                "retried": retried,
+                "size": len(body.get("messages", [])) or 1,
+                "latency_ms": round((done - sent) * 1000, 3),
+                # Gönderimin planlanan zamandan gecikmesi (istemci doygunluğu)
+                "lag_ms": round((sent - scheduled) * 1000, 3),
+                "sent": sent,
+                "done": done
+            })
+
+    def run(self, records, speed):
+        """speed=1 orijinal hız, 2 iki kat hızlı, 0 bekleme olmadan"""
+        start = time.perf_counter()
+        origin = records[0]["ts"]
+        for record in records:
+            scheduled = start + (record["ts"] - origin) / speed if speed > 0 else time.perf_counter()
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.executor.submit(self.send, record, scheduled)
+        self.executor.shutdown(wait=True)
+        return self.results
+
+def is_error(result):
+    """Bağlantı hatası, 5xx veya kayıttaki durum kodundan farklı yanıt"""
+    status = result["status"]
+    captured = result.get("captured_status")
+    return status == 0 or status >= 500 or (captured is not None and status != captured)
+
+def summarize(results):
+    """Uç nokta bazında gecikme yüzdelikleri ve toplam işlem hızı
+
+    Yüzdelikler yalnızca 2xx yanıtlardan hesaplanır; hızlı dönen 401/4xx
+    yanıtlar gecikmeyi olduğundan iyi göstermez.
+    """
+    summary = {}
+    if not results:
+        return summary
+    groups = {"all": results}
+    for r in results:
+        groups.setdefault(r["ep"], []).append(r)
+    elapsed = max(r["done"] for r in results) - min(r["sent"] for r in results)
+    for endpoint, items in groups.items():
+        latencies = np.array([r["latency_ms"] for r in items if 200 <= r["status"] < 300])
+        summary[endpoint] = {
+            "requests": len(items),
+            "ok": len(latencies),
+            "errors": sum(1 for r in items if is_error(r)),
+            "retried": sum(1 for r in items if r.get("retried")),
+            "rps": len(items) / elapsed if elapsed > 0 else 0.0,
+            "messages_per_sec": sum(r["size"] for r in items) / elapsed if elapsed > 0 else 0.0,
+            **{f"p{p}_ms": float(np.percentile(latencies, p)) if len(latencies) else 0.0 for p in PERCENTILES},
+            "max_ms": float(latencies.max()) if len(latencies) else 0.0,
+            "max_lag_ms": max(r["lag_ms"] for r in items)
+        }
+    return summary
+
+def print_summary(summary):
+    for endpoint, stats in summary.items():
+        print(f"{endpoint:15} n={stats['requests']:<7} hata={stats['errors']:<5} "
+              f"{stats['rps']:8.1f} istek/sn  "
+              + "  ".join(f"p{p}={stats[f'p{p}_ms']:.1f}ms" for p in PERCENTILES)
+              + f"  max={stats['max_ms']:.1f}ms")
+
+def read_results(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(path_a, path_b):
+    """İki koşunun yüzdelik ve işlem hızı farkları"""
+    a, b = summarize(read_results(path_a)), summarize(read_results(path_b))
+    metrics = ["rps", "messages_per_sec"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms", "errors"]
+    print(f"{'uç nokta':15} {'metrik':18} {'A':>10} {'B':>10} {'fark':>9}")
+    for endpoint in a:
+        if endpoint not in b:
+            continue
+        for metric in metrics:
+            va, vb = a[endpoint][metric], b[endpoint][metric]
+            change = f"{(vb - va) / va * 100:+.1f}%" if va else "-"
+            print(f"{endpoint:15} {metric:18} {va:10.1f} {vb:10.1f} {change:>9}")
+    for name, summary in (("A", a), ("B", b)):
+        stats = summary.get("all")
+        if stats and stats["errors"]:
+            print(f"⚠️ {name} koşusunda {stats['errors']}/{stats['requests']} istek hatalı veya kayıttan farklı "
+                  "durum koduyla döndü; gecikme karşılaştırması yalnızca başarılı yanıtları kapsar")
+
+def main():
+    parser = argparse.ArgumentParser(description="Kaydedilmiş trafiği yeniden oynat ve karşılaştır")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = sub.add_parser("replay", help="Kaydı API'ye yeniden gönder")
+    replay_parser.add_argument("captures", nargs="+", help="traffic.<pid>.ndjson[.gz] dosyaları")
+    replay_parser.add_argument("--url", default="http://localhost:8000")
+    replay_parser.add_argument("--username", default="testuser")
+    replay_parser.add_argument("--password", default="secret")
+    replay_parser.add_argument("--speed", type=float, default=1.0, help="Zaman ölçeği (1 = orijinal, 0 = beklemesiz)")
+    replay_parser.add_argument("--concurrency", type=int, default=64, help="Eşzamanlı bağlantı sınırı")
+    replay_parser.add_argument("--out", required=True, help="İstek başına sonuçların yazılacağı NDJSON")
+
+    compare_parser = sub.add_parser("compare", help="İki koşunun sonuçlarını karşılaştır")
+    compare_parser.add_argument("run_a")
+    compare_parser.add_argument("run_b")
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        compare(args.run_a, args.run_b)
+        return
+
+    records = load_capture(args.captures)
+    if not records:
+        print("❌ Kayıt bulunamadı")
+        sys.exit(1)
+    span = records[-1]["ts"] - records[0]["ts"]
+    print(f"🚀 {len(records)} istek yeniden oynatılıyor (kayıt süresi {span:.1f} sn, hız x{args.speed})")
+    replayer = Replayer(args.url, args.username, args.password, args.concurrency)
+    results = replayer.run(records, args.speed)
+    with open(args.out, "w", encoding="utf-8") as f:
+        for r in results:
+            f.write(json.dumps(r) + "\n")
+    print_summary(summarize(results))
+    if replayer.tokens.renewals:
+        print(f"🔑 Access token {replayer.tokens.renewals} kez yenilendi")
+    print(f"✅ Sonuçlar yazıldı: {args.out}")
+
+if __name__ == "__main__":
+    main()
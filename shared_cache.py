@@ -0,0 +1,166 @@
+"""
+Worker'lar arası paylaşılan tahmin önbelleği.
+
+Aynı makinedeki tüm worker süreçleri tek bir bellek eşlemeli (mmap) dosyayı
+sabit boyutlu, açık adreslemeli bir hash tablosu olarak kullanır. Anahtar,
+temizlenmiş metin ve model sürümünün 128 bitlik özetidir; değer skor ve
+zaman damgasıdır. Bir worker'ın skorladığı mesaj diğerleri için de isabettir.
+
+Okumalar kilitsizdir: her slotun sıra sayacı (seqlock) yazım sırasında tektir,
+okuyucu sayaç değişmişse kaydı yok sayar. Yazımlar slot gruplarına ayrılmış
+dosya bayt aralığı kilitleriyle (fcntl) süreçler arasında sıralanır.
+"""
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"SMSCACHE"
+LAYOUT_VERSION = 1
+HEADER_SIZE = 4096  # başlık + süreçler arası yazma kilitlerinin bayt aralıkları
+LOCK_OFFSET = 64
+SLOT_DTYPE = np.dtype([
+    ("seq", "<u8"),
+    ("key_hi", "<u8"),
+    ("key_lo", "<u8"),
+    ("score", "<f8"),
+    ("ts", "<f8")
+])
+SLOT_STRUCT = struct.Struct("<QQQdd")
+SEQ_STRUCT = struct.Struct("<Q")
+BODY_STRUCT = struct.Struct("<QQdd")
+SLOT_SIZE = SLOT_STRUCT.size
+
+
+class SharedPredictionCache:
+    """mmap üzerinde açık adreslemeli (doğrusal sondalama) skor önbelleği"""
+
+    def __init__(self, path: str, slots: int = 131072, ttl: float = 3600.0, max_probe: int = 8,
+                 lock_stripes: int = 64):
+        self.path = path
+        self.slots = slots
+        self.ttl = ttl
+        self.max_probe = max_probe
+        self.lock_stripes = min(lock_stripes, HEADER_SIZE - LOCK_OFFSET)
+        size = HEADER_SIZE + slots * SLOT_DTYPE.itemsize
+
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        # Dosyayı ilk açan süreç başlığı yazar; diğerleri bekler ve doğrular
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, LOCK_OFFSET, 0)
+        try:
+            if os.fstat(self.fd).st_size == 0:
+                os.ftruncate(self.fd, size)
+                header = MAGIC + np.array([LAYOUT_VERSION, slots], dtype="<u8").tobytes()
+                os.pwrite(self.fd, header, 0)
+            header = os.pread(self.fd, 24, 0)
+            layout, existing_slots = np.frombuffer(header[8:24], dtype="<u8")
+            if header[:8] != MAGIC or layout != LAYOUT_VERSION or existing_slots != slots:
+                raise ValueError(f"Önbellek dosyası farklı bir düzenle oluşturulmuş, silip yeniden başlatın: {path}")
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, LOCK_OFFSET, 0)
+
+        self.mm = mmap.mmap(self.fd, size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+        # Okuma/yazma struct ile doğrudan mmap üzerinde; NumPy görünümü yalnızca rapor taraması için
+        self.table = np.frombuffer(self.mm, dtype=SLOT_DTYPE, count=slots, offset=HEADER_SIZE)
+        # fcntl kilitleri süreç başınadır; aynı süreçteki iş parçacıkları ayrıca sıralanır
+        self.thread_locks = [threading.Lock() for _ in range(self.lock_stripes)]
+        self.stats_lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "torn_reads": 0, "inserts": 0, "overwrites": 0}
+
+    @staticmethod
+    def key(cleaned_text: str, version: str) -> tuple:
+        digest = hashlib.blake2b(f"{version}\0{cleaned_text}".encode("utf-8"), digest_size=16).digest()
+        hi = int.from_bytes(digest[:8], "little")
+        # Boş slot (0, 0) ile karışmaması için alt yarının en düşük biti her zaman 1
+        lo = int.from_bytes(digest[8:], "little") | 1
+        return hi, lo
+
+    def _count(self, name: str):
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _offset(self, slot: int) -> int:
+        return HEADER_SIZE + slot * SLOT_SIZE
+
+    def get(self, key: tuple):
+        """Geçerli kayıt varsa skoru döndür, yoksa None"""
+        hi, lo = key
+        now = time.time()
+        mm = self.mm
+        start = hi % self.slots
+        for probe in range(self.max_probe):
+            offset = self._offset((start + probe) % self.slots)
+            seq, slot_hi, slot_lo, score, ts = SLOT_STRUCT.unpack_from(mm, offset)
+            if seq & 1 or SEQ_STRUCT.unpack_from(mm, offset)[0] != seq:
+                # Başka bir süreç yazıyor; kaydı atla
+                self._count("torn_reads")
+                continue
+            if slot_hi == 0 and slot_lo == 0:
+                break
+            if slot_hi == hi and slot_lo == lo:
+                if now - ts > self.ttl:
+                    self._count("expired")
+                    break
+                self._count("hits")
+                return score
+        self._count("misses")
+        return None
+
+    def put(self, key: tuple, score: float):
+        """Skoru yaz: aynı anahtar, boş slot, süresi dolmuş slot veya sondalamadaki en eski slot"""
+        hi, lo = key
+        now = time.time()
+        mm = self.mm
+        start = hi % self.slots
+        target = None
+        oldest = None
+        oldest_ts = None
+        for probe in range(self.max_probe):
+            slot = (start + probe) % self.slots
+            _, slot_hi, slot_lo, _, slot_ts = SLOT_STRUCT.unpack_from(mm, self._offset(slot))
+            if (slot_hi == hi and slot_lo == lo) or (slot_hi == 0 and slot_lo == 0):
+                target = slot
+                break
+            if target is None and now - slot_ts > self.ttl:
+                target = slot
+            if oldest is None or slot_ts < oldest_ts:
+                oldest, oldest_ts = slot, slot_ts
+        if target is None:
+            target = oldest
+            self._count("overwrites")
+
+        # Aynı slota yazan süreçler aynı kilit grubunda sıralanır; eşzamanlı iki
+        # yazımda biri kaybolabilir, bu yalnızca sonraki bir ıskalamadır
+        stripe = target % self.lock_stripes
+        offset = self._offset(target)
+        with self.thread_locks[stripe]:
+            # Kilit dosyanın başlık içindeki bayt aralığı üzerindedir, veriye dokunmaz
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, LOCK_OFFSET + stripe)
+            try:
+                seq = SEQ_STRUCT.unpack_from(mm, offset)[0]
+                SEQ_STRUCT.pack_into(mm, offset, seq + 1)
+                BODY_STRUCT.pack_into(mm, offset + SEQ_STRUCT.size, hi, lo, score, now)
+                SEQ_STRUCT.pack_into(mm, offset, seq + 2)
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, LOCK_OFFSET + stripe)
+        self._count("inserts")
+
+    def report(self) -> dict:
+        with self.stats_lock:
+            stats = dict(self.stats)
+        occupied = (self.table["key_hi"] != 0) | (self.table["key_lo"] != 0)
+        fresh = occupied & (time.time() - self.table["ts"] <= self.ttl)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["slots"] = self.slots
+        stats["occupied"] = int(occupied.sum())
+        stats["fresh"] = int(fresh.sum())
+        stats["ttl"] = self.ttl
+        stats["path"] = self.path
+        return stats
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Mikro-Toplama Testi
+MicroBatcher'ın sahte bir predict_fn ile model dosyası olmadan doğrulanması:
+eşzamanlı tekil isteklerin toplanması, model durumlarının ayrı skorlanması,
+hataların ilgili isteklere dönmesi ve büyük batch'lerin işlere bölünmesi.
+"""
+
+import asyncio
+import threading
+import time
+
+from batching import MicroBatcher
+
+class RecordingPredictor:
+    """Her çağrının boyutunu ve sırasını kaydeden sahte model"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, messages, state):
+        with self.lock:
+            self.calls.append((state, list(messages)))
+        time.sleep(self.delay)
+        if "boom" in messages:
+            raise ValueError("boom")
+        return [{"message": m, "state": state} for m in messages]
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_concurrent_requests_are_batched():
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(f"m{i}", "v1") for i in range(8)))
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+    assert [r["message"] for r in results] == [f"m{i}" for i in range(8)]
+    assert len(predictor.calls) == 1 and len(predictor.calls[0][1]) == 8
+
+def test_states_are_scored_separately():
+    """Yeniden yükleme sırasında iki sürümün mesajları aynı model çağrısına girmez"""
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(*(batcher.submit(f"m{i}", "v1" if i % 2 else "v2") for i in range(6)))
+        await batcher.stop()
+        return results
+
+    results = run(scenario())
+    assert all(r["state"] == ("v1" if i % 2 else "v2") for i, r in enumerate(results))
+    assert len(predictor.calls) == 2
+    for state, messages in predictor.calls:
+        assert all((int(m[1:]) % 2 == 1) == (state == "v1") for m in messages)
+
+def test_failure_reaches_callers():
+    predictor = RecordingPredictor()
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=20)
+        results = await asyncio.gather(batcher.submit("boom", "v1"), batcher.submit("ok", "v1"),
+                                       return_exceptions=True)
+        # Hatadan sonra toplayıcı çalışmaya devam eder
+        after = await batcher.submit("later", "v1")
+        await batcher.stop()
+        return results, after
+
+    results, after = run(scenario())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert after["message"] == "later"
+
+def test_large_batch_does_not_block_single_requests():
+    """Büyük batch işlere bölünür; araya giren tekil istek tüm batch'i beklemez"""
+    predictor = RecordingPredictor(delay=0.05)
+
+    async def scenario():
+        batcher = MicroBatcher(predictor, max_batch_size=8, max_wait_ms=1, max_job_size=10)
+        batcher.start()
+        large = asyncio.create_task(batcher.submit_many([f"b{i}" for i in range(50)], "v1"))
+        await asyncio.sleep(0.01)
+        single = await batcher.submit("single", "v1")
+        single_done = len(predictor.calls)
+        results = await large
+        await batcher.stop()
+        return single, single_done, results, batcher.report()
+
+    single, single_done, results, report = run(scenario())
+    assert single["message"] == "single"
+    assert [r["message"] for r in results] == [f"b{i}" for i in range(50)]
+    assert all(len(messages) <= 10 for _, messages in predictor.calls)
+    assert single_done < len(predictor.calls), "Tekil istek büyük batch'in tamamını bekledi"
+    assert report["split_jobs"] == 5
+
+if __name__ == "__main__":
+    print("🧪 Mikro-toplama testi başlıyor...\n")
+    test_concurrent_requests_are_batched()
+    test_states_are_scored_separately()
+    test_failure_reaches_callers()
+    test_large_batch_does_not_block_single_requests()
+    print("✅ Mikro-toplama testleri geçti!")
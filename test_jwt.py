@@ -97,6 +97,50 @@ def test_login():
         print(f"❌ Login hatası: {e}")
         return None
 
+def test_refresh_token():
+    """Refresh token testi"""
+    print("\n🔄 Refresh token testi başlıyor...")
+    
+    login_data = {
+        "username": "testuser",
+        "password": "secret"
+    }
+    
+    try:
+        response = requests.post(f"{BASE_URL}/token", json=login_data)
+        refresh_token = response.json().get('refresh_token')
+        if not refresh_token:
+            print("❌ Login yanıtında refresh token yok")
+            return
+        
+        # Şifre göndermeden yeni access token al
+        response = requests.post(f"{BASE_URL}/token/refresh", json={"refresh_token": refresh_token})
+        if response.status_code == 200:
+            token_data = response.json()
+            print("✅ Refresh başarılı!")
+            print(f"Yeni token: {token_data['access_token'][:50]}...")
+        else:
+            print(f"❌ Refresh başarısız: {response.status_code}")
+            print(f"Hata: {response.text}")
+            return
+        
+        # Kullanılmış refresh token tekrar kabul edilmemeli
+        response = requests.post(f"{BASE_URL}/token/refresh", json={"refresh_token": refresh_token})
+        if response.status_code == 401:
+            print("✅ Kullanılmış refresh token reddedildi!")
+        else:
+            print(f"❌ Kullanılmış refresh token kabul edildi: {response.status_code}")
+        
+        # Yeniden kullanım tespiti tüm aileyi iptal eder
+        response = requests.post(f"{BASE_URL}/token/refresh", json={"refresh_token": token_data['refresh_token']})
+        if response.status_code == 401:
+            print("✅ Yeniden kullanım sonrası token ailesi iptal edildi!")
+        else:
+            print(f"❌ Token ailesi iptal edilmedi: {response.status_code}")
+            
+    except Exception as e:
+        print(f"❌ Refresh token hatası: {e}")
+
 def test_protected_endpoint(token):
     """Korumalı endpoint testi"""
     print("\n🛡️ Korumalı endpoint testi başlıyor...")
@@ -194,8 +238,11 @@ def main():
         
         # 6. Kullanıcı bilgileri testi
         test_user_info(token)
+        
+        # 7. Refresh token testi
+        test_refresh_token()
     
-    # 7. Yeni kayıtlı kullanıcı ile login testi
+    # 8. Yeni kayıtlı kullanıcı ile login testi
     if registration_success:
         print("\n🔐 Yeni kullanıcı ile login testi...")
         new_login_data = {
@@ -217,7 +264,8 @@ def main():
     print("- Mevcut kullanıcı: testuser / secret")
     print("- Yeni kullanıcı: testuser2 / strongpass123")
     print("- JWT token süresi: 30 dakika")
-    print("- Endpoint'ler: /register, /token, /predict, /predict/batch, /users/me")
+    print("- Refresh token süresi: 30 gün (her kullanımda yenilenir)")
+    print("- Endpoint'ler: /register, /token, /token/refresh, /token/revoke, /predict, /predict/batch, /users/me")
     print("- Veritabanı: PostgreSQL (localhost:5434/mydb)")
     print("- Kullanıcı bilgileri artık veritabanında saklanıyor!")
     print("- Kullanıcı kaydı ve duplikasyon kontrolü aktif!")
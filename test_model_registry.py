@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Model Kaydı Testi
+ModelRegistry'nin sahte bir yükleyiciyle model dosyası olmadan doğrulanması:
+ilk istekte yükleme, bellek bütçesinde LRU tahliyesi, bilinmeyen model ve
+eşzamanlı isteklerde tek yükleme.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from model_registry import ModelRegistry
+
+MB = 1024 * 1024
+
+class FakeLoader:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.loads = []
+
+    def __call__(self, name, path):
+        self.loads.append(name)
+        time.sleep(self.delay)
+        return SimpleNamespace(name=name, version=f"{name}-v1", path=path)
+
+def make_registry(root, names, budget_mb, loader):
+    for name in names:
+        os.makedirs(os.path.join(root, name))
+    return ModelRegistry(root, budget_bytes=budget_mb * MB, loader=loader, size_of=lambda state: 40 * MB)
+
+def test_lazy_load_and_cache():
+    with tempfile.TemporaryDirectory() as root:
+        loader = FakeLoader()
+        registry = make_registry(root, ["tr", "en"], 100, loader)
+        assert registry.available() == ["en", "tr"]
+        first = registry.get("tr")
+        assert registry.get("tr") is first and loader.loads == ["tr"]
+        assert first.path == os.path.join(root, "tr")
+
+def test_lru_eviction_over_budget():
+    """Bütçe iki modele yeter; üçüncüsü en uzun süredir kullanılmayanı çıkarır"""
+    with tempfile.TemporaryDirectory() as root:
+        loader = FakeLoader()
+        registry = make_registry(root, ["a", "b", "c"], 100, loader)
+        registry.get("a")
+        registry.get("b")
+        registry.get("a")  # b artık en eski
+        registry.get("c")
+        report = registry.report()
+        assert [m["name"] for m in report["loaded"]] == ["a", "c"]
+        assert report["used_bytes"] <= report["budget_bytes"]
+        assert [e["event"] for e in report["events"]] == ["load", "load", "load", "evict"]
+
+def test_unknown_model():
+    with tempfile.TemporaryDirectory() as root:
+        registry = make_registry(root, ["tr"], 100, FakeLoader())
+        try:
+            registry.get("../tr")
+        except KeyError:
+            pass
+        else:
+            raise AssertionError("Bilinmeyen model KeyError vermeli")
+
+def test_concurrent_requests_load_once():
+    with tempfile.TemporaryDirectory() as root:
+        loader = FakeLoader(delay=0.1)
+        registry = make_registry(root, ["tr"], 100, loader)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get("tr"))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert loader.loads == ["tr"] and len({id(r) for r in results}) == 1
+
+def test_manual_evict_and_latency():
+    with tempfile.TemporaryDirectory() as root:
+        registry = make_registry(root, ["tr"], 100, FakeLoader())
+        registry.get("tr")
+        registry.record_inference("tr", 0.02, 10)
+        registry.record_inference("tr", 0.04, 10)
+        assert registry.evict("tr") and not registry.evict("tr")
+        latency = registry.report()["latency"]["tr"]
+        assert latency["calls"] == 2 and abs(latency["avg_ms"] - 30.0) < 1e-6
+
+if __name__ == "__main__":
+    print("🧪 Model kaydı testi başlıyor...\n")
+    test_lazy_load_and_cache()
+    test_lru_eviction_over_budget()
+    test_unknown_model()
+    test_concurrent_requests_load_once()
+    test_manual_evict_and_latency()
+    print("✅ Model kaydı testleri geçti!")
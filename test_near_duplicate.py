@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Yakın Kopya İndeksi Testi
+SimHash indeksinin model dosyası olmadan doğrulanması: şablon varyasyonlarının
+bulunması, farklı mesajların ve model sürümlerinin ayrılması, LRU tahliyesi.
+"""
+
+from near_duplicate import NearDuplicateIndex, hamming, simhash
+
+TEMPLATE = "congratulations you have won a free cruise call now to claim your prize before friday"
+
+def test_variation_is_found():
+    """Şablonun tek kelimelik varyasyonu önceki kararı yeniden kullanır"""
+    index = NearDuplicateIndex(max_entries=100, max_distance=10)
+    index.insert(index.fingerprint(TEMPLATE), 0.99, "v1")
+
+    variation = TEMPLATE.replace("friday", "monday")
+    distance = hamming(simhash(TEMPLATE.split()), simhash(variation.split()))
+    assert distance <= 10, f"Varyasyon mesafesi beklenenden büyük: {distance}"
+    hit = index.lookup(index.fingerprint(variation), "v1")
+    assert hit is not None and hit[0] == 0.99
+
+def test_unrelated_message_misses():
+    index = NearDuplicateIndex(max_entries=100, max_distance=5)
+    index.insert(index.fingerprint(TEMPLATE), 0.99, "v1")
+    other = "hi mum the train is late so i will be home around seven tonight"
+    assert index.lookup(index.fingerprint(other), "v1") is None
+
+def test_version_and_short_messages():
+    """Başka model sürümünün kararı kullanılmaz; kısa mesajların parmak izi yoktur"""
+    index = NearDuplicateIndex(max_entries=100)
+    index.insert(index.fingerprint(TEMPLATE), 0.99, "v1")
+    assert index.lookup(index.fingerprint(TEMPLATE), "v2") is None
+    assert index.fingerprint("ok see you") is None
+
+def test_lru_eviction():
+    index = NearDuplicateIndex(max_entries=2, max_distance=3)
+    messages = [f"{TEMPLATE} {word} {word} {word}" for word in ("alpha", "bravo", "charlie")]
+    for message in messages:
+        index.insert(index.fingerprint(message), 0.99, "v1")
+    report = index.report()
+    assert report["size"] == 2 and report["evictions"] == 1
+    # Tahliye edilen kaydın bant kovalarında kalıntı olmamalı
+    live = set(index.entries)
+    assert all(ids <= live for buckets in index.buckets for ids in buckets.values())
+
+if __name__ == "__main__":
+    print("🧪 Yakın kopya indeksi testi başlıyor...\n")
+    test_variation_is_found()
+    test_unrelated_message_misses()
+    test_version_and_short_messages()
+    test_lru_eviction()
+    print("✅ Yakın kopya indeksi testleri geçti!")
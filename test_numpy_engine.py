@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+NumPy Motoru Uyum Testi
+sms_model.h5 modelini .npz'ye aktarır ve örnek mesajlarda NumPy ileri geçişinin
+Keras skorlarını tolerans içinde ürettiğini doğrular.
+"""
+
+import os
+import tempfile
+
+import numpy as np
+
+from main import MODEL_PATH, TOKENIZER_PATH, clean_text, load_model_files
+from numpy_engine import NumpyModel, export_model, pad_sequences
+
+# Skorlar arasında izin verilen en büyük mutlak fark
+TOLERANCE = 1e-4
+
+SAMPLE_MESSAGES = [
+    "You have won a free iPhone 13 Pro Max! Click the link to claim your prize.",
+    "I'm sorry to hear that you're having trouble with your account. Let me know if I can help you with anything.",
+    "URGENT: Your account has been suspended. Call now to reactivate!",
+    "Hi, how are you doing today? Would you like to grab coffee later?",
+    "Congratulations! You have been selected for a £1000 cash reward. Text WIN to 80086",
+    "Ok lar... Joking wif u oni...",
+    "",
+    "FREE entry in 2 a wkly comp to win FA Cup final tkts 21st May 2005. " * 10
+]
+
+def test_numpy_parity():
+    """NumPy ve Keras skorlarının ve tokenizer çıktılarının karşılaştırılması"""
+    keras_model, keras_tokenizer = load_model_files(MODEL_PATH, TOKENIZER_PATH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        npz_path = os.path.join(tmp, "sms_model.npz")
+        export_model(MODEL_PATH, TOKENIZER_PATH, npz_path)
+        numpy_model = NumpyModel.load(npz_path)
+
+    cleaned = [clean_text(m) for m in SAMPLE_MESSAGES]
+    keras_seqs = keras_tokenizer.texts_to_sequences(cleaned)
+    numpy_seqs = numpy_model.tokenizer.texts_to_sequences(cleaned)
+    assert keras_seqs == numpy_seqs, "Tokenizer çıktıları farklı"
+
+    pad = pad_sequences(numpy_seqs, maxlen=100, padding='post')
+    keras_scores = keras_model.predict(pad, verbose=0)[:, 0]
+    numpy_scores = numpy_model.predict(pad)[:, 0]
+
+    max_diff = float(np.abs(keras_scores - numpy_scores).max())
+    print(f"En büyük skor farkı: {max_diff:.2e}")
+    assert max_diff <= TOLERANCE, f"NumPy skorları Keras'tan {max_diff:.2e} sapıyor"
+    assert ((keras_scores > 0.5) == (numpy_scores > 0.5)).all(), "Sınıflandırma kararları farklı"
+
+if __name__ == "__main__":
+    print("🧪 NumPy motoru uyum testi başlıyor...\n")
+    test_numpy_parity()
+    print("\n✅ NumPy motoru Keras ile uyumlu!")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Aşamalı Hat Testi
+StagedPipeline'ın sahte aşamalarla model dosyası olmadan doğrulanması: sonuç
+sırası, önden hazırlanan parça sınırı, ön işleme ile skorlamanın örtüşmesi ve
+hata durumunda bekleyen işlerin iptali.
+"""
+
+import threading
+import time
+
+from pipeline import StagedPipeline
+
+def test_results_keep_input_order():
+    pipeline = StagedPipeline(lambda chunk, state: [m.upper() for m in chunk],
+                              lambda prepared, state: [(state, m) for m in prepared], chunk_size=3)
+    messages = [f"m{i}" for i in range(10)]
+    try:
+        assert pipeline.run(messages, "v1") == [("v1", m.upper()) for m in messages]
+        report = pipeline.report()
+        assert report["chunks"] == 4 and report["messages"] == 10
+    finally:
+        pipeline.shutdown()
+
+def test_bounded_prefetch():
+    """Skorlama yavaşken en fazla max_pending parça önden hazırlanır"""
+    prepared_count = [0]
+    scored_count = [0]
+    max_ahead = [0]
+    lock = threading.Lock()
+
+    def prepare(chunk, state):
+        with lock:
+            prepared_count[0] += 1
+            max_ahead[0] = max(max_ahead[0], prepared_count[0] - scored_count[0])
+        return chunk
+
+    def score(prepared, state):
+        time.sleep(0.01)
+        with lock:
+            scored_count[0] += 1
+        return prepared
+
+    pipeline = StagedPipeline(prepare, score, chunk_size=1, max_pending=2)
+    try:
+        pipeline.run(list(range(20)), None)
+    finally:
+        pipeline.shutdown()
+    assert max_ahead[0] <= 2, f"{max_ahead[0]} parça önden hazırlandı"
+
+def test_prepare_overlaps_scoring():
+    """Uyuyan (GIL'i bırakan) aşamalar örtüşür: süre toplamdan belirgin kısa"""
+    delay = 0.03
+    chunks = 8
+
+    def prepare(chunk, state):
+        time.sleep(delay)
+        return chunk
+
+    def score(prepared, state):
+        time.sleep(delay)
+        return prepared
+
+    pipeline = StagedPipeline(prepare, score, chunk_size=1, max_pending=2)
+    try:
+        start = time.perf_counter()
+        pipeline.run(list(range(chunks)), None)
+        elapsed = time.perf_counter() - start
+    finally:
+        pipeline.shutdown()
+    assert elapsed < 2 * delay * chunks * 0.8, f"Aşamalar örtüşmedi: {elapsed:.3f} sn"
+
+def test_score_failure_cancels_pending():
+    prepared = []
+
+    def prepare(chunk, state):
+        prepared.append(chunk[0])
+        return chunk
+
+    def score(chunk, state):
+        raise RuntimeError("model hatası")
+
+    pipeline = StagedPipeline(prepare, score, chunk_size=1, max_pending=2)
+    try:
+        pipeline.run(list(range(50)), None)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Skorlama hatası çağırana ulaşmalı")
+    finally:
+        pipeline.shutdown()
+    assert len(prepared) <= 3, "Hatadan sonra parçalar hazırlanmaya devam etti"
+
+if __name__ == "__main__":
+    print("🧪 Aşamalı hat testi başlıyor...\n")
+    test_results_keep_input_order()
+    test_bounded_prefetch()
+    test_prepare_overlaps_scoring()
+    test_score_failure_cancels_pending()
+    print("✅ Aşamalı hat testleri geçti!")
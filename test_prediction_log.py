@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tahmin Kaydı Testi
+Write-behind kaydın bellek içi SQLite ile model dosyası olmadan doğrulanması:
+toplu yazım, tampon sınırı, yazma hatasında sayaç ve kapanışta boşaltma.
+"""
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from prediction_log import PredictionLog
+
+def make_table():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    metadata = MetaData()
+    table = Table(
+        "predictions", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("username", String, nullable=False),
+        Column("prediction", Float, nullable=False)
+    )
+    metadata.create_all(engine)
+    return engine, table
+
+def row_count(engine, table) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar()
+
+def test_flush_in_batches():
+    engine, table = make_table()
+    log = PredictionLog(engine, table, flush_size=4)
+    for i in range(10):
+        assert log.append({"username": "alice", "prediction": i / 10})
+    log.flush()
+    report = log.report()
+    assert row_count(engine, table) == 10
+    assert report["written"] == 10 and report["batches"] == 3 and report["buffered"] == 0
+
+def test_buffer_limit_drops():
+    engine, table = make_table()
+    log = PredictionLog(engine, table, max_buffer=3)
+    accepted = [log.append({"username": "bob", "prediction": 0.5}) for _ in range(5)]
+    assert accepted == [True, True, True, False, False]
+    assert log.report()["dropped"] == 2
+
+def test_write_failure_is_counted():
+    """Yazma hatası istek yoluna taşınmaz, başarısız kayıt olarak sayılır"""
+    engine, table = make_table()
+    log = PredictionLog(engine, table)
+    log.append({"username": None, "prediction": 0.5})  # NOT NULL ihlali
+    log.flush()
+    assert log.report()["failed"] == 1 and row_count(engine, table) == 0
+
+def test_stop_drains_buffer():
+    engine, table = make_table()
+    log = PredictionLog(engine, table, flush_size=1000, flush_interval=60)
+    log.start()
+    for _ in range(25):
+        log.append({"username": "carol", "prediction": 0.1})
+    log.stop()
+    assert row_count(engine, table) == 25
+
+if __name__ == "__main__":
+    print("🧪 Tahmin kaydı testi başlıyor...\n")
+    test_flush_in_batches()
+    test_buffer_limit_drops()
+    test_write_failure_is_counted()
+    test_stop_drains_buffer()
+    print("✅ Tahmin kaydı testleri geçti!")
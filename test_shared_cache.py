@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Paylaşılan Önbellek Testi
+SharedPredictionCache'in model dosyası olmadan doğrulanması: çok süreçli
+(fork) eşzamanlı yazma/okuma altında bozuk kayıt dönmemesi, TTL sonrası
+ıskalama, tablo dolduğunda üzerine yazma ve düzen uyuşmazlığının reddi.
+"""
+
+import multiprocessing as mp
+import os
+import tempfile
+import time
+
+from shared_cache import SharedPredictionCache
+
+def expected_score(i: int) -> float:
+    """Her anahtarın kendine özgü skoru; yırtık okuma farklı bir değer döndürür"""
+    return (i * 7919 % 10007) / 10007
+
+def stress_worker(path, slots, worker, keys, rounds, errors):
+    cache = SharedPredictionCache(path, slots=slots, ttl=60)
+    bad = 0
+    for r in range(rounds):
+        for i in range(keys):
+            # Süreçler aynı anahtarlara farklı sırayla yazar, slotlar çekişir
+            k = (i * (worker + 1) + r) % keys
+            key = cache.key(f"mesaj {k}", "v1")
+            if (k + worker) % 2:
+                cache.put(key, expected_score(k))
+            else:
+                score = cache.get(key)
+                if score is not None and score != expected_score(k):
+                    bad += 1
+    errors.put(bad)
+
+def test_fork_stress_no_torn_reads():
+    ctx = mp.get_context("fork")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache")
+        # Anahtar sayısı slot sayısından fazla: sondalama ve üzerine yazma da çalışır
+        slots, keys = 256, 400
+        errors = ctx.Queue()
+        procs = [ctx.Process(target=stress_worker, args=(path, slots, w, keys, 20, errors)) for w in range(4)]
+        for p in procs:
+            p.start()
+        bad = [errors.get(timeout=120) for _ in procs]
+        for p in procs:
+            p.join(timeout=30)
+            assert p.exitcode == 0, f"Worker çıkış kodu {p.exitcode}"
+        assert sum(bad) == 0, f"{sum(bad)} okuma yanlış skor döndürdü"
+
+        # Ana süreç de diğer süreçlerin yazdıklarını görür
+        cache = SharedPredictionCache(path, slots=slots, ttl=60)
+        report = cache.report()
+        assert report["occupied"] > 0
+        hits = [cache.get(cache.key(f"mesaj {k}", "v1")) for k in range(keys)]
+        assert all(s is None or s == expected_score(k) for k, s in enumerate(hits))
+
+def test_ttl_expiry():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedPredictionCache(os.path.join(tmp, "cache"), slots=64, ttl=0.2)
+        key = cache.key("tebrikler kazandınız", "v1")
+        cache.put(key, 0.97)
+        assert cache.get(key) == 0.97
+        time.sleep(0.3)
+        assert cache.get(key) is None
+        assert cache.report()["expired"] == 1 and cache.report()["fresh"] == 0
+        # Süresi dolmuş slot yeniden kullanılır
+        cache.put(key, 0.5)
+        assert cache.get(key) == 0.5
+
+def test_full_table_overwrite():
+    """Tablo dolunca sondalamadaki en eski kayıt üzerine yazılır; son yazılanlar okunur"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedPredictionCache(os.path.join(tmp, "cache"), slots=16, ttl=60, max_probe=4)
+        keys = [cache.key(f"mesaj {i}", "v1") for i in range(64)]
+        for i, key in enumerate(keys):
+            cache.put(key, expected_score(i))
+        report = cache.report()
+        assert report["occupied"] == 16 and report["overwrites"] > 0
+        assert cache.get(keys[-1]) == expected_score(63)
+        found = [cache.get(key) for key in keys]
+        assert sum(s is not None for s in found) <= 16
+        assert all(s is None or s == expected_score(i) for i, s in enumerate(found))
+
+def test_version_isolation_and_layout_check():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache")
+        cache = SharedPredictionCache(path, slots=64, ttl=60)
+        cache.put(cache.key("merhaba", "v1"), 0.1)
+        assert cache.get(cache.key("merhaba", "v2")) is None
+        try:
+            SharedPredictionCache(path, slots=128)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Farklı slot sayısıyla açılan dosya reddedilmeli")
+
+if __name__ == "__main__":
+    print("🧪 Paylaşılan önbellek testi başlıyor...\n")
+    test_fork_stress_no_torn_reads()
+    test_ttl_expiry()
+    test_full_table_overwrite()
+    test_version_isolation_and_layout_check()
+    print("✅ Paylaşılan önbellek testleri geçti!")
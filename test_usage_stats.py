@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Kullanım İstatistikleri Testi
+UsageStats'ın bellek içi SQLite ile model dosyası olmadan doğrulanması:
+kullanıcı ve genel özetler, "*" kullanıcı adının genel özetle çakışmaması,
+artırarak yazma, artımlı yenileme, NaN skorlar ve kapanışta yazma hatası.
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, String, Table, UniqueConstraint, create_engine
+from sqlalchemy.pool import StaticPool
+
+import usage_stats
+from usage_stats import UsageStats
+
+def make_stats(**kwargs):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    metadata = MetaData()
+    table = Table(
+        "usage_stats", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("scope", String(8), nullable=False),
+        Column("username", String, nullable=False),
+        Column("bucket_start", DateTime, nullable=False),
+        Column("updated_at", DateTime, nullable=False),
+        Column("messages", Integer, nullable=False),
+        Column("spam", Integer, nullable=False),
+        Column("score_sum", Float, nullable=False),
+        *[Column(f"bin_{i}", Integer, nullable=False) for i in range(10)],
+        UniqueConstraint("scope", "username", "bucket_start")
+    )
+    metadata.create_all(engine)
+    return UsageStats(engine, table, **kwargs)
+
+def test_user_and_global_summaries():
+    stats = make_stats()
+    stats.record("alice", 0.95, True)
+    stats.record("alice", 0.05, False)
+    stats.record("bob", 0.55, True)
+    stats.flush()
+    stats.refresh()
+
+    alice = stats.summary("alice")
+    assert alice["messages"] == 2 and alice["spam"] == 1 and alice["spam_rate"] == 0.5
+    assert alice["histogram"][0] == 1 and alice["histogram"][9] == 1
+    overall = stats.summary()
+    assert overall["username"] is None and overall["messages"] == 3
+    assert stats.report()["users"] == 2
+    assert stats.summary("nobody")["messages"] == 0
+
+def test_star_username_is_not_global():
+    stats = make_stats()
+    stats.record("*", 0.9, True)
+    stats.record("carol", 0.1, False)
+    stats.flush()
+    stats.refresh()
+    assert stats.summary("*")["messages"] == 1
+    assert stats.summary()["messages"] == 2
+
+def test_flushes_accumulate():
+    """Aynı dilime ikinci yazım satırı artırır (upsert)"""
+    stats = make_stats()
+    for _ in range(3):
+        stats.record("dave", 0.8, True)
+        stats.flush()
+    stats.refresh()
+    summary = stats.summary("dave")
+    assert summary["messages"] == 3 and len(summary["buckets"]) == 1
+
+def test_incremental_refresh_reads_only_changes():
+    stats = make_stats()
+    stats.record("erin", 0.2, False)
+    stats.record("frank", 0.7, True)
+    stats.flush()
+    stats.refresh()
+
+    original_overlap = usage_stats.REFRESH_OVERLAP
+    usage_stats.REFRESH_OVERLAP = timedelta(0)
+    try:
+        read_before = stats.report()["rows_read"]
+        stats.refresh()
+        assert stats.report()["rows_read"] == read_before, "Değişiklik yokken satır okundu"
+
+        stats.record("erin", 0.9, True)
+        stats.flush()
+        stats.refresh()
+        # Yalnızca erin ve genel satırı yeniden okunur
+        assert stats.report()["rows_read"] == read_before + 2
+    finally:
+        usage_stats.REFRESH_OVERLAP = original_overlap
+    assert stats.summary("erin")["messages"] == 2
+    assert stats.summary("frank")["messages"] == 1
+    assert stats.summary()["messages"] == 3
+
+def test_window_expiry():
+    stats = make_stats(window_hours=1)
+    stats.record("gina", 0.3, False)
+    stats.flush()
+    stats.refresh()
+    assert stats.summary("gina")["messages"] == 1
+    # Pencere dilimin ötesine kayınca dilim özetten düşer
+    stats.window_hours = -1
+    stats.refresh()
+    assert stats.summary("gina")["messages"] == 0 and stats.summary()["messages"] == 0
+
+def test_non_finite_scores_are_skipped():
+    stats = make_stats()
+    stats.record("hank", float("nan"), True)
+    stats.record("hank", float("inf"), True)
+    stats.record("hank", 1.5, True)  # aralık dışı, son aralığa sıkıştırılır
+    stats.flush()
+    stats.refresh()
+    assert stats.report()["skipped_nonfinite"] == 2
+    summary = stats.summary("hank")
+    assert summary["messages"] == 1 and summary["histogram"][9] == 1 and summary["mean_score"] == 1.0
+
+def test_stop_survives_flush_error():
+    stats = make_stats()
+    stats.record("ivan", 0.4, False)
+    stats.engine = create_engine("sqlite:////nonexistent/dir/usage.db")
+    stats.stop()  # hata loglanır, kapanış devam eder
+    assert stats.report()["failed"] == 1 and stats.report()["pending_buckets"] == 2
+
+def test_bucket_start_is_utc():
+    stats = make_stats(bucket_seconds=3600)
+    stats.record("jane", 0.6, True)
+    stats.flush()
+    stats.refresh()
+    start = datetime.fromisoformat(stats.summary("jane")["buckets"][0]["start"])
+    assert start.minute == 0 and abs((datetime.utcnow() - start).total_seconds()) < 3600
+
+if __name__ == "__main__":
+    print("🧪 Kullanım istatistikleri testi başlıyor...\n")
+    test_user_and_global_summaries()
+    test_star_username_is_not_global()
+    test_flushes_accumulate()
+    test_incremental_refresh_reads_only_changes()
+    test_window_expiry()
+    test_non_finite_scores_are_skipped()
+    test_stop_survives_flush_error()
+    test_bucket_start_is_utc()
+    print("✅ Kullanım istatistikleri testleri geçti!")
@@ -0,0 +1,160 @@
+"""
+Üretim trafiği kaydı.
+
+Örneklenen /predict, /predict/batch ve /token istekleri zamanlamalarıyla
+birlikte satır başına bir JSON kaydı olarak yerel dosyaya yazılır. Mesaj
+metni varsayılan olarak saklanmaz: her kelime anahtarlı özetten türetilmiş
+aynı uzunlukta bir harf dizisiyle değiştirilir. Ham metin yalnızca açıkça
+istenirse (raw_text) saklanır. Kayıtlar replay_traffic.py ile gerçek mesaj uzunluğu, kopya oranı ve
+batch boyutu dağılımıyla yeniden oynatılır.
+"""
+
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+EMAIL_RE = re.compile(r'[\w.+-]+@[\w-]+\.[\w.-]+')
+URL_RE = re.compile(r'(?:https?://|www\.)\S+', re.IGNORECASE)
+DIGIT_RE = re.compile(r'\d')
+WORD_RE = re.compile(r'[^\W\d_]+')
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _mask_email(match) -> str:
+    email = match.group()
+    at = email.index("@")
+    return "x" * at + "@" + "x" * (len(email) - at - 1)
+
+
+def anonymize_message(text: str) -> str:
+    """Bağlantı, e-posta ve rakamları aynı uzunlukta maskele
+
+    Yalnızca bu kalıpları kapsar; adlar, adresler gibi diğer kişisel veriler
+    metinde kalır. Rakamlar clean_text tarafından zaten silindiği için model
+    girdisi değişmez.
+    """
+    text = URL_RE.sub(lambda m: "http://" + "x" * max(len(m.group()) - 7, 0), text)
+    text = EMAIL_RE.sub(_mask_email, text)
+    return DIGIT_RE.sub("0", text)
+
+
+def pseudonymize_message(text: str, key: bytes) -> str:
+    """Her kelimeyi anahtarlı özetinden türetilen aynı uzunlukta harf dizisiyle değiştir
+
+    Metin geri elde edilemez; mesaj ve kelime uzunlukları, boşluk/noktalama
+    düzeni ile aynı (veya yakın) mesajların eşitliği korunur, böylece önbellek
+    ve yakın kopya isabetleri yeniden oynatmada da oluşur.
+    """
+    def replace(match):
+        word = match.group().lower()
+        digest = b""
+        block = 0
+        while len(digest) < len(word):
+            digest += hmac.new(key, f"{block}\0{word}".encode("utf-8"), hashlib.sha256).digest()
+            block += 1
+        return "".join(LETTERS[b % len(LETTERS)] for b in digest[:len(word)])
+    return WORD_RE.sub(replace, anonymize_message(text))
+
+
+def capture_file_path(path: str, pid: int) -> str:
+    """Her worker kendi dosyasına yazar: traffic.ndjson -> traffic.<pid>.ndjson"""
+    compressed = path.endswith(".gz")
+    root, ext = os.path.splitext(path[:-3] if compressed else path)
+    return f"{root}.{pid}{ext}" + (".gz" if compressed else "")
+
+
+def open_capture(path: str, mode: str):
+    """Düz veya .gz kayıt dosyasını metin olarak aç"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class TrafficRecorder:
+    """Örneklenmiş, anonim istek kaydedici"""
+
+    def __init__(self, path: str, sample_rate: float = 0.01, salt: str = "", flush_interval: float = 1.0,
+                 raw_text: bool = False):
+        # Ön yüklemede nesne ana süreçte oluşur; dosya adı worker'da ilk yazımda belirlenir
+        self.path = path
+        self.sample_rate = sample_rate
+        self.salt = salt
+        self.raw_text = raw_text
+        if raw_text:
+            print(f"⚠️ UYARI: Trafik kaydı ham mesaj metnini saklıyor ({path}); yalnızca bağlantı, "
+                  "e-posta ve rakamlar maskelenir, diğer kişisel veriler dosyada kalır")
+        self.flush_interval = flush_interval
+        self.file = None
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.stats = {"seen": 0, "recorded": 0}
+
+    def scrub(self, text: str) -> str:
+        """Mesajı kayda uygun hale getir: varsayılan kelime özetleri, raw_text ile maskelenmiş ham metin"""
+        if self.raw_text:
+            return anonymize_message(text)
+        return pseudonymize_message(text, self.salt.encode("utf-8"))
+
+    def anonymize_user(self, username: str) -> str:
+        """Kullanıcı adını tuzlu özetle değiştir; kullanıcı başına dağılım korunur"""
+        return hashlib.sha256((self.salt + username).encode("utf-8")).hexdigest()[:12]
+
+    @contextmanager
+    def capture(self, endpoint: str, username: str, body_fn):
+        """İsteği örneklenirse süresi ve durum koduyla birlikte kaydet
+
+        body_fn yalnızca örneklenen isteklerde çağrılır; anonimleştirme maliyeti
+        diğer isteklere yansımaz.
+        """
+        self.stats["seen"] += 1
+        if random.random() >= self.sample_rate:
+            yield
+            return
+        ts = time.time()
+        start = time.perf_counter()
+        status_code = 200
+        try:
+            yield
+        except Exception as e:
+            status_code = getattr(e, "status_code", 500)
+            raise
+        finally:
+            self.write({
+                "ts": round(ts, 6),
+                "ep": endpoint,
+                "user": self.anonymize_user(username) if username else None,
+                "status": status_code,
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+                "body": body_fn()
+            })
+
+    def write(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self.lock:
+            if self.file is None:
+                path = capture_file_path(self.path, os.getpid())
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                self.file = open_capture(path, "a")
+            self.file.write(line)
+            self.stats["recorded"] += 1
+            now = time.monotonic()
+            if now - self.last_flush >= self.flush_interval:
+                self.file.flush()
+                self.last_flush = now
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def report(self) -> dict:
+        return {"enabled": True, "path": capture_file_path(self.path, os.getpid()), "sample_rate": self.sample_rate,
+                "raw_text": self.raw_text, **self.stats}
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Cascade Ön Sınıflandırıcı Eğitim Scripti
+Ana modelin eğitildiği veriyle hash'lenmiş n-gram lojistik regresyonu eğitir,
+ayrılan test kümesinde tam modelle uyumunu ve farklı belirsizlik bantlarında
+modele gitmeden karara bağlanan mesaj oranını raporlar.
+
+Kullanım:
+    python train_cascade.py --data spam.csv --output model/cascade.npz
+"""
+
+import argparse
+import csv
+import random
+
+import numpy as np
+
+from cascade import HashedNgramClassifier
+
+# Değerlendirilecek belirsizlik bantları (alt, üst)
+CANDIDATE_BANDS = [(0.01, 0.99), (0.02, 0.98), (0.05, 0.95), (0.1, 0.9), (0.2, 0.8), (0.3, 0.7)]
+
+def read_dataset(path, text_column, label_column, encoding):
+    """CSV dosyasından mesajları ve etiketleri oku"""
+    texts, labels = [], []
+    with open(path, newline='', encoding=encoding) as f:
+        for row in csv.DictReader(f):
+            label = row[label_column].strip().lower()
+            texts.append(row[text_column])
+            labels.append(1 if label in ("spam", "1") else 0)
+    return texts, labels
+
+def full_model_scores(messages):
+    """Aynı clean_text + tokenizer + model hattı ile tam model skorlarını hesapla
+
+    Dönüş: (skorlar, model sürümü). Sürüm, API'nin yüklediği dosyalardan
+    aynı şekilde hesaplanır (INFERENCE_ENGINE dahil); cascade yalnızca bu
+    sürümün önünde çalışır.
+    """
+    from main import clean_text, load_versioned_artifacts, pad_sequences
+
+    model, tokenizer, version = load_versioned_artifacts()
+    seqs = tokenizer.texts_to_sequences([clean_text(m) for m in messages])
+    pad = pad_sequences(seqs, maxlen=100, padding='post')
+    return model.predict(pad, batch_size=256, verbose=0)[:, 0], version
+
+def evaluate_bands(cascade_scores, model_scores):
+    """Her bant için kısa devre oranı ve tam modelle karar uyumu"""
+    model_verdicts = model_scores > 0.5
+    report = []
+    for low, high in CANDIDATE_BANDS:
+        confident = (cascade_scores <= low) | (cascade_scores >= high)
+        final = np.where(confident, cascade_scores > 0.5, model_verdicts)
+        report.append({
+            "low": low,
+            "high": high,
+            "short_circuit_rate": float(confident.mean()),
+            "agreement": float((final == model_verdicts).mean()),
+            "confident_agreement": float(((cascade_scores > 0.5) == model_verdicts)[confident].mean()) if confident.any() else 1.0
+        })
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Cascade ön sınıflandırıcısını eğit")
+    parser.add_argument("--data", required=True, help="Eğitim CSV dosyası")
+    parser.add_argument("--text-column", default="v2")
+    parser.add_argument("--label-column", default="v1")
+    parser.add_argument("--encoding", default="latin-1")
+    parser.add_argument("--output", default="model/cascade.npz")
+    parser.add_argument("--buckets", type=int, default=2 ** 18)
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--min-agreement", type=float, default=0.995,
+                        help="Seçilecek bandın tam modelle asgari uyumu")
+    args = parser.parse_args()
+
+    from main import clean_text
+
+    texts, labels = read_dataset(args.data, args.text_column, args.label_column, args.encoding)
+    order = list(range(len(texts)))
+    random.Random(42).shuffle(order)
+    split = int(len(order) * (1 - args.test_size))
+    train_idx, test_idx = order[:split], order[split:]
+    print(f"📊 {len(train_idx)} eğitim, {len(test_idx)} test mesajı")
+
+    cleaned = [clean_text(t) for t in texts]
+    clf = HashedNgramClassifier.train(
+        [cleaned[i] for i in train_idx],
+        [labels[i] for i in train_idx],
+        n_buckets=args.buckets,
+        epochs=args.epochs
+    )
+
+    test_messages = [texts[i] for i in test_idx]
+    cascade_scores = clf.score_many([cleaned[i] for i in test_idx])
+    test_labels = np.array([labels[i] for i in test_idx])
+    print(f"✓ Cascade etiket doğruluğu: {((cascade_scores > 0.5) == test_labels).mean():.4f}")
+
+    print("🧪 Tam model skorları hesaplanıyor...")
+    model_scores, model_version = full_model_scores(test_messages)
+    print(f"✓ Tam model ({model_version}) etiket doğruluğu: {((model_scores > 0.5) == test_labels).mean():.4f}")
+
+    report = evaluate_bands(cascade_scores, model_scores)
+    print(f"\n{'Bant':>12} {'Kısa devre':>11} {'Uyum':>8}")
+    for row in report:
+        print(f"{row['low']:>5.2f}-{row['high']:<5.2f} {row['short_circuit_rate']:>11.2%} {row['agreement']:>8.4f}")
+
+    # Uyum eşiğini sağlayan bantlar arasından en çok kısa devre yapanı seç
+    eligible = [r for r in report if r["agreement"] >= args.min_agreement]
+    chosen = max(eligible, key=lambda r: r["short_circuit_rate"]) if eligible else report[0]
+    clf.low, clf.high = chosen["low"], chosen["high"]
+    clf.metadata = {
+        "model_version": model_version,
+        "test_size": len(test_idx),
+        "band": [chosen["low"], chosen["high"]],
+        "offline_short_circuit_rate": chosen["short_circuit_rate"],
+        "offline_agreement": chosen["agreement"],
+        "bands": report
+    }
+    clf.save(args.output)
+    print(f"\n✅ Seçilen bant {chosen['low']}-{chosen['high']}: "
+          f"%{chosen['short_circuit_rate'] * 100:.1f} kısa devre, {chosen['agreement']:.4f} uyum")
+    print(f"✅ Kaydedildi: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+Artımlı kullanıcı ve genel sınıflandırma istatistikleri.
+
+Her tahmin bellekte saat dilimli sayaçlara ve sabit aralıklı skor
+histogramına eklenir (kullanıcı başına ve genel). Arka plan iş parçacığı
+birikmiş farkları periyodik olarak özet tabloya toplayarak yazar (upsert) ve
+yalnızca son yenilemeden beri değişen dilimleri okuyarak özetleri günceller. Uç nokta bu hazır özeti sözlükten
+döndürür; panolar ham kayıtları taramaz.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import and_, select
+
+# Genel toplamlar ayrı bir kapsamda tutulur; hiçbir kullanıcı adı onlarla çakışamaz
+USER_SCOPE = "user"
+GLOBAL_SCOPE = "global"
+GLOBAL_KEY = (GLOBAL_SCOPE, "")
+# Artımlı yenilemede geç işlenen yazımlar için geriye dönük tarama payı
+REFRESH_OVERLAP = timedelta(minutes=2)
+EPOCH = datetime(1970, 1, 1)
+
+
+class UsageStats:
+    """Zaman dilimli sayaçlar ve skor histogramları"""
+
+    def __init__(self, engine, table, bucket_seconds: int = 3600, flush_interval: float = 60.0,
+                 window_hours: int = 168):
+        self.engine = engine
+        self.table = table
+        self.bin_columns = [c.name for c in table.columns if c.name.startswith("bin_")]
+        self.bins = len(self.bin_columns)
+        self.bucket_seconds = bucket_seconds
+        self.flush_interval = flush_interval
+        self.window_hours = window_hours
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.buckets = {}  # (scope, username) -> {bucket_start: dilim toplamları}
+        self.summaries = {}
+        self.last_refresh = None
+        self.window_bucket = None
+        self.as_of = None
+        self.stopping = threading.Event()
+        self.thread = None
+        self.stats = {"recorded": 0, "flushes": 0, "rows_written": 0, "rows_read": 0, "failed": 0,
+                      "skipped_nonfinite": 0}
+
+    def record(self, username: str, score: float, is_spam: bool):
+        """Tahmini kullanıcının ve genelin içinde bulunulan dilimine ekle"""
+        if not math.isfinite(score):
+            # NaN/sonsuz skor histogramı ve ortalamayı bozar; sayılıp atlanır
+            with self.lock:
+                self.stats["skipped_nonfinite"] += 1
+            return
+        score = min(max(score, 0.0), 1.0)
+        bucket = int(time.time() // self.bucket_seconds) * self.bucket_seconds
+        bin_index = min(int(score * self.bins), self.bins - 1)
+        with self.lock:
+            for key in ((USER_SCOPE, username), GLOBAL_KEY):
+                counters = self.pending.get((key, bucket))
+                if counters is None:
+                    counters = self.pending[(key, bucket)] = [0, 0, 0.0] + [0] * self.bins
+                counters[0] += 1
+                counters[1] += is_spam
+                counters[2] += score
+                counters[3 + bin_index] += 1
+            self.stats["recorded"] += 1
+
+    def start(self):
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="usage-stats", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            self.thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            # Kapanışta diğer bileşenlerin kapanması engellenmez
+            print(f"Kullanım istatistikleri kapanışta yazılamadı, {len(self.pending)} dilim kaybedildi: {e}")
+
+    def _run(self):
+        while True:
+            try:
+                self.flush()
+                self.refresh()
+            except Exception as e:
+                print(f"Kullanım istatistikleri güncellenemedi: {e}")
+            if self.stopping.wait(self.flush_interval):
+                return
+
+    def flush(self):
+        """Birikmiş farkları tabloya topla; hata olursa farklar bir sonraki tura kalır"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return
+        updated_at = datetime.utcnow()
+        rows = [
+            {
+                "scope": scope,
+                "username": username,
+                "bucket_start": datetime.utcfromtimestamp(bucket),
+                "updated_at": updated_at,
+                "messages": counters[0],
+                "spam": counters[1],
+                "score_sum": counters[2],
+                **dict(zip(self.bin_columns, counters[3:]))
+            }
+            for ((scope, username), bucket), counters in pending.items()
+        ]
+        try:
+            with self.engine.begin() as conn:
+                self._upsert(conn, rows)
+        except Exception:
+            with self.lock:
+                for key, counters in pending.items():
+                    current = self.pending.setdefault(key, [0, 0, 0.0] + [0] * self.bins)
+                    for i, value in enumerate(counters):
+                        current[i] += value
+                self.stats["failed"] += 1
+            raise
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(rows)
+
+    def _upsert(self, conn, rows: list):
+        """Satırları (scope, username, bucket_start) üzerinde artırarak yaz"""
+        counter_columns = ["messages", "spam", "score_sum"] + self.bin_columns
+        dialect = conn.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert
+            stmt = insert(self.table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["scope", "username", "bucket_start"],
+                set_={**{c: self.table.c[c] + stmt.excluded[c] for c in counter_columns},
+                      "updated_at": stmt.excluded.updated_at}
+            )
+            conn.execute(stmt, rows)
+            return
+        # Diğer veritabanları için satır satır güncelle, yoksa ekle
+        for row in rows:
+            condition = and_(self.table.c.scope == row["scope"], self.table.c.username == row["username"],
+                             self.table.c.bucket_start == row["bucket_start"])
+            result = conn.execute(
+                self.table.update().where(condition).values({
+                    **{c: self.table.c[c] + row[c] for c in counter_columns},
+                    "updated_at": row["updated_at"]
+                })
+            )
+            if result.rowcount == 0:
+                conn.execute(self.table.insert().values(row))
+
+    def refresh(self):
+        """Son yenilemeden beri değişen dilimleri okuyup yalnızca etkilenen özetleri yeniden kur
+
+        Satırlar dilimin toplamını taşır, aynı satırı iki kez okumak zararsızdır;
+        bu yüzden geç işlenen (ör. başka worker'ın) yazımlar için sorgu son
+        yenilemeden REFRESH_OVERLAP kadar geriden başlar.
+        """
+        now = datetime.utcnow()
+        since = now - timedelta(hours=self.window_hours)
+        query = select(self.table).where(self.table.c.bucket_start >= since)
+        if self.last_refresh is not None:
+            query = query.where(self.table.c.updated_at >= self.last_refresh - REFRESH_OVERLAP)
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).mappings().all()
+
+        changed = set()
+        for row in rows:
+            key = (row["scope"], row["username"])
+            self.buckets.setdefault(key, {})[row["bucket_start"]] = {
+                "messages": row["messages"],
+                "spam": row["spam"],
+                "score_sum": row["score_sum"],
+                "histogram": [row[c] for c in self.bin_columns]
+            }
+            changed.add(key)
+
+        # Pencereden düşen dilimler yalnızca pencere bir dilim sınırını geçince taranır
+        window_bucket = int(-(-(since - EPOCH).total_seconds() // self.bucket_seconds))
+        if window_bucket != self.window_bucket:
+            self.window_bucket = window_bucket
+            for key, buckets in self.buckets.items():
+                expired = [start for start in buckets if start < since]
+                for start in expired:
+                    del buckets[start]
+                if expired:
+                    changed.add(key)
+
+        for key in changed:
+            buckets = self.buckets.get(key)
+            if buckets:
+                # Anahtar başına tek referans ataması; okuyucular kilitsiz tutarlı bir görünüm alır
+                self.summaries[key] = self._summarize(buckets)
+            else:
+                self.buckets.pop(key, None)
+                self.summaries.pop(key, None)
+        self.last_refresh = now
+        self.as_of = now
+        self.stats["rows_read"] += len(rows)
+
+    def _summarize(self, buckets: dict) -> dict:
+        """Bir anahtarın penceredeki dilimlerinden özet kur"""
+        summary = {"messages": 0, "spam": 0, "score_sum": 0.0, "histogram": [0] * self.bins, "buckets": []}
+        for start in sorted(buckets):
+            bucket = buckets[start]
+            summary["messages"] += bucket["messages"]
+            summary["spam"] += bucket["spam"]
+            summary["score_sum"] += bucket["score_sum"]
+            summary["histogram"] = [a + b for a, b in zip(summary["histogram"], bucket["histogram"])]
+            summary["buckets"].append({
+                "start": start.isoformat(),
+                "messages": bucket["messages"],
+                "spam": bucket["spam"],
+                "spam_rate": bucket["spam"] / bucket["messages"] if bucket["messages"] else 0.0,
+                "histogram": bucket["histogram"]
+            })
+        messages = summary["messages"]
+        summary["spam_rate"] = summary["spam"] / messages if messages else 0.0
+        summary["mean_score"] = summary.pop("score_sum") / messages if messages else 0.0
+        return summary
+
+    def summary(self, username: Optional[str] = None) -> dict:
+        """Kullanıcının, username verilmezse genelin hazır özetini döndür (veritabanına gitmez)"""
+        summary = self.summaries.get(GLOBAL_KEY if username is None else (USER_SCOPE, username))
+        return {
+            "username": username,
+            "as_of": self.as_of.isoformat() if self.as_of else None,
+            "bucket_seconds": self.bucket_seconds,
+            "window_hours": self.window_hours,
+            "histogram_bins": [round(i / self.bins, 4) for i in range(self.bins + 1)],
+            **(summary or {"messages": 0, "spam": 0, "spam_rate": 0.0, "mean_score": 0.0,
+                           "histogram": [0] * self.bins, "buckets": []})
+        }
+
+    def report(self) -> dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["pending_buckets"] = len(self.pending)
+        stats["users"] = max(len(self.summaries) - (GLOBAL_KEY in self.summaries), 0)
+        stats["as_of"] = self.as_of.isoformat() if self.as_of else None
+        return stats